@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from app.core.security import get_admin_user
+from app.models.user import User
+from app.services.cache import cache_stats
+from app.services.category_model import request_model_training
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    admin: User = Depends(get_admin_user),
+):
+    """Backend size / eviction counters plus per-cache hit and miss counts for this worker."""
+    return cache_stats()
+
+
+@router.post("/category-model/train", status_code=202)
+def train_category_model(
+    admin: User = Depends(get_admin_user),
+):
+    """Retrains the naive Bayes category model in the background."""
+    return {"scheduled": request_model_training()}
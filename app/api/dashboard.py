@@ -3,11 +3,11 @@ from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.security import get_current_user
-from app.services.dashboard_service import build_dashboard
 from app.schemas.dashboard import DashboardResponse
 from app.models.user import User
-from app.services.dashboard_cache import get_cached_dashboard, warm_dashboard_cache
-from fastapi import BackgroundTasks
+from app.services.dashboard_cache import get_dashboard_json
+from app.utils.encoded_response import gzip_json_response
+from fastapi import Request
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -33,24 +33,13 @@ from datetime import date
 
 @router.get("/", response_model=DashboardResponse)
 def get_dashboard(
-    background_tasks: BackgroundTasks,
+    request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Only use cache if NO date filtering is applied
-    if not start_date and not end_date:
-        cached = get_cached_dashboard(current_user.id)
-        if cached:
-            return cached
-
-    # If no dates, we can warm cache for next time
-    if not start_date and not end_date:
-        background_tasks.add_task(
-            warm_dashboard_cache,
-            db,
-            current_user.id,
-        )
-
-    return build_dashboard(db, current_user.id, start_date, end_date)
\ No newline at end of file
+    # Every range is cached, keyed by (user, start, end, data version), as
+    # pre-encoded gzipped JSON that is sent back untouched
+    body = get_dashboard_json(db, current_user.id, start_date, end_date)
+    return gzip_json_response(request, body)
\ No newline at end of file
@@ -3,8 +3,18 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.core.security import get_current_user
 from app.models.user import User
-from app.services.erl_service import calculate_economic_metrics
-from app.schemas.erl import ERLInsights
+from app.services.erl_service import get_erl_insights_json
+from app.utils.encoded_response import gzip_json_response
+from fastapi import Request
+from app.schemas.erl import ERLInsights, ERLTimeSeries
+from app.schemas.scenario import ScenarioRequest, ScenarioResponse
+from app.services.scenario_service import evaluate_scenarios
+from app.services.erl_timeseries_service import DEFAULT_WINDOWS, erl_timeseries
+from fastapi import HTTPException, Query
+from typing import List
+
+MAX_WINDOW_MONTHS = 36
+MAX_WINDOWS = 4
 
 router = APIRouter(prefix="/erl", tags=["Economic Reality Layer"])
 
@@ -17,10 +27,43 @@ def get_db():
 
 @router.get("/insights", response_model=ERLInsights)
 def get_erl_insights(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get Economic Reality Layer insights for the current user.
     """
-    return calculate_economic_metrics(db, current_user.id)
+    return gzip_json_response(request, get_erl_insights_json(db, current_user.id))
+
+
+@router.get("/timeseries", response_model=ERLTimeSeries)
+def get_erl_timeseries(
+    windows: List[int] = Query(list(DEFAULT_WINDOWS)),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Month-by-month ERL trend: trailing-window burn rate, savings rate and
+    tax efficiency for each requested window (default 3 and 12 months).
+    """
+    windows = sorted(set(windows))
+    if len(windows) > MAX_WINDOWS or any(w < 1 or w > MAX_WINDOW_MONTHS for w in windows):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Up to {MAX_WINDOWS} windows of 1-{MAX_WINDOW_MONTHS} months",
+        )
+    return erl_timeseries(db, current_user.id, windows)
+
+
+@router.post("/scenarios", response_model=ScenarioResponse)
+def run_scenarios(
+    payload: ScenarioRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    What-if projections: evaluates every scenario (income / expense changes)
+    against the user's last 12 months in one vectorized pass.
+    """
+    return evaluate_scenarios(db, current_user.id, payload.scenarios)
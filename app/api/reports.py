@@ -1,14 +1,27 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from datetime import date, timedelta
+from datetime import date
+from typing import List
 
 from app.core.database import SessionLocal
 from app.core.security import get_current_user
 from app.models.tax_record import TaxRecord
-from app.services.tax_calculator import compute_summary
+from app.services.tax_calculator import compute_summary_from_totals
+from app.services.tax_regimes import TaxRuleError, rule_table_for
+from app.services.rollup_service import summarize_range
+from app.services.report_export_service import export_xlsx_response
+from app.services.columnar_export_service import export_parquet_response
+from app.services.period_comparison_service import compare_periods
+from app.schemas.report_comparison import PeriodComparisonResponse
+from app.schemas.tax_regime import RegimeComparisonResponse
+from app.services.regime_comparison_service import compare_regimes
+from app.utils.periods import resolve_period
+from app.utils.money import paise_to_rupees, rupees_to_paise, sum_rupees
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+MAX_COMPARE_PERIODS = 6
+
 
 def get_db():
     db = SessionLocal()
@@ -18,12 +31,6 @@ def get_db():
         db.close()
 
 
-def financial_year_range(today: date):
-    if today.month >= 4:
-        return date(today.year, 4, 1), date(today.year + 1, 3, 31)
-    return date(today.year - 1, 4, 1), date(today.year, 3, 31)
-
-
 @router.get("/summary")
 def get_summary(
     period: str | None = Query(default=None),
@@ -32,45 +39,51 @@ def get_summary(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    today = date.today()
+    start_date, end_date = resolve_period(period, start_date, end_date)
 
-    # 🔑 Period logic
-    if period:
-        if period == "month":
-            start_date = date(today.year, today.month, 1)
-            end_date = today
+    # Whole months come from monthly_rollups, only the edges hit tax_records
+    totals = summarize_range(db, current_user.id, start_date, end_date)
 
-        elif period == "prev_month":
-            first_this_month = date(today.year, today.month, 1)
-            last_prev_month = first_this_month - timedelta(days=1)
-            start_date = date(last_prev_month.year, last_prev_month.month, 1)
-            end_date = last_prev_month
+    income = totals.get(("income",), [0.0, 0.0, 0.0, 0])
+    expense = totals.get(("expense",), [0.0, 0.0, 0.0, 0])
+    tax = sum_rupees(t[1] for t in totals.values())
 
-        elif period == "fy":
-            start_date, end_date = financial_year_range(today)
+    # Income tax rules of the FY the period ends in
+    return compute_summary_from_totals(income[0], expense[0], tax, rule_table_for(end_date))
 
-        elif period == "ytd":
-            start_date = date(today.year, 1, 1)
-            end_date = today
 
-        elif period == "custom":
-            pass
-
-        else:
-            raise HTTPException(status_code=400, detail="Invalid period")
+@router.get("/compare", response_model=PeriodComparisonResponse)
+def compare_report_periods(
+    periods: List[str] = Query(..., description="e.g. periods=fy&periods=prev_fy"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Compare several periods side by side, deltas are against the first one"""
+    labels = list(dict.fromkeys(periods))
 
-    query = db.query(TaxRecord).filter(
-        TaxRecord.user_id == current_user.id
-    )
+    if len(labels) < 2 or len(labels) > MAX_COMPARE_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 2 and {MAX_COMPARE_PERIODS} distinct periods",
+        )
+    if "custom" in labels:
+        raise HTTPException(status_code=400, detail="custom is not supported for comparison")
 
-    if start_date:
-        query = query.filter(TaxRecord.date >= start_date)
+    ranges = [(label, *resolve_period(label, None, None)) for label in labels]
+    return compare_periods(db, current_user.id, ranges)
 
-    if end_date:
-        query = query.filter(TaxRecord.date <= end_date)
 
-    records = query.all()
-    return compute_summary(records)
+@router.get("/regimes", response_model=RegimeComparisonResponse)
+def compare_tax_regimes(
+    fy: str | None = Query(default=None, description="e.g. 2024-25, defaults to the current FY"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Income tax for one financial year under every regime, side by side"""
+    try:
+        return compare_regimes(db, current_user.id, fy)
+    except TaxRuleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/export")
@@ -78,45 +91,26 @@ def export_report(
     period: str | None = Query(default=None),
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
+    format: str = Query(default="csv"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    """Export financial report as CSV"""
+    """Export financial report as CSV, XLSX or Parquet"""
     from fastapi.responses import StreamingResponse
     from io import StringIO
     import csv
-    
-    # Use same date filtering logic as get_summary
-    if period:
-        today = date.today()
-
-        if period == "month":
-            start_date = date(today.year, today.month, 1)
-            end_date = today
 
-        elif period == "prev_month":
-            first_this_month = date(today.year, today.month, 1)
-            last_prev_month = first_this_month - timedelta(days=1)
-            start_date = date(last_prev_month.year, last_prev_month.month, 1)
-            end_date = last_prev_month
-
-        elif period == "fy":
-            if today.month >= 4:
-                start_date = date(today.year, 4, 1)
-                end_date = date(today.year + 1, 3, 31)
-            else:
-                start_date = date(today.year - 1, 4, 1)
-                end_date = date(today.year, 3, 31)
+    # Use same date filtering logic as get_summary
+    start_date, end_date = resolve_period(period, start_date, end_date)
 
-        elif period == "ytd":
-            start_date = date(today.year, 1, 1)
-            end_date = today
+    if format == "xlsx":
+        return export_xlsx_response(db, current_user.id, start_date, end_date)
 
-        elif period == "custom":
-            pass
+    if format == "parquet":
+        return export_parquet_response(db, current_user.id, start_date, end_date)
 
-        else:
-            raise HTTPException(status_code=400, detail="Invalid period")
+    if format != "csv":
+        raise HTTPException(status_code=400, detail="Invalid format")
 
     # Query records
     query = db.query(TaxRecord).filter(TaxRecord.user_id == current_user.id)
@@ -158,9 +152,9 @@ def export_report(
             f"{record.tax_amount:.2f}" if record.tax_amount else "0.00",
             f"{record.total_amount:.2f}" if record.total_amount else "0.00"
         ])
-        total_taxable += record.taxable_amount
-        total_tax += record.tax_amount or 0
-        total_amount += record.total_amount or 0
+        total_taxable += rupees_to_paise(record.taxable_amount or 0)
+        total_tax += rupees_to_paise(record.tax_amount or 0)
+        total_amount += rupees_to_paise(record.total_amount or 0)
     
     # Summary row
     writer.writerow([])
@@ -169,9 +163,9 @@ def export_report(
         "",
         "",
         "",
-        f"{total_taxable:.2f}",
-        f"{total_tax:.2f}",
-        f"{total_amount:.2f}"
+        f"{paise_to_rupees(total_taxable):.2f}",
+        f"{paise_to_rupees(total_tax):.2f}",
+        f"{paise_to_rupees(total_amount):.2f}"
     ])
     
     # Prepare response
@@ -8,6 +8,9 @@ from app.crud.tax_record import get_user_tax_records
 from app.models.user import User
 from app.services.tax_calculator import compute_tax_for_record
 from app.models.tax_record import TaxRecord
+from app.services.rollup_service import apply_records_to_rollups
+from app.services.aggregate_deltas import begin_write, publish_write, record_contributions
+from app.services.user_category_index import category_samples
 
 # ✅ THIS WAS MISSING
 router = APIRouter(prefix="/records", tags=["Tax Records"])
@@ -36,67 +39,91 @@ def create_record(
     compute_tax_for_record(db_record)
 
     db.add(db_record)
+    apply_records_to_rollups(db, current_user.id, [db_record])
+    contributions = record_contributions([db_record])
+    samples = category_samples([db_record])
+    token = begin_write(current_user.id)
     db.commit()
-    db.refresh(db_record)
 
-    # ❌ Invalidate cache so reports are fresh
-    from app.services.dashboard_cache import invalidate_dashboard_cache
-    invalidate_dashboard_cache(current_user.id)
+    # Apply the new row to cached dashboards and the category index instead of dropping them
+    publish_write(current_user.id, token, contributions, samples)
+    db.refresh(db_record)
 
     return db_record
 
 
 from typing import Optional
-from datetime import date, timedelta
+from datetime import date
+from fastapi import HTTPException, Query, Request, Response
+from app.services.record_listing_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NDJSON_MEDIA_TYPE,
+    encode_records_json,
+    ndjson_stream_response,
+    select_record_rows,
+)
+from app.services.columnar_export_service import ARROW_STREAM_MEDIA_TYPE, arrow_stream_response
+from app.utils.periods import resolve_period
 
 @router.get("/", response_model=list[TaxRecordResponse])
 def list_records(
+    request: Request,
     period: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    tax_rate: Optional[float] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Build query with date filtering
-    query = db.query(TaxRecord).filter(TaxRecord.user_id == current_user.id)
-    
     # Apply period-based filtering
-    if period:
-        today = date.today()
-        
-        if period == "month":
-            start_date = date(today.year, today.month, 1)
-            end_date = today
-        elif period == "prev_month":
-            first_this_month = date(today.year, today.month, 1)
-            last_prev_month = first_this_month - timedelta(days=1)
-            start_date = date(last_prev_month.year, last_prev_month.month, 1)
-            end_date = last_prev_month
-        elif period == "fy":
-            if today.month >= 4:
-                start_date = date(today.year, 4, 1)
-                end_date = date(today.year + 1, 3, 31)
-            else:
-                start_date = date(today.year - 1, 4, 1)
-                end_date = date(today.year, 3, 31)
-        elif period == "ytd":
-            start_date = date(today.year, 1, 1)
-            end_date = today
-        elif period == "custom":
-            pass  # Use provided start_date and end_date
-    
-    # Apply date filters to query
-    if start_date:
-        query = query.filter(TaxRecord.date >= start_date)
-    if end_date:
-        query = query.filter(TaxRecord.date <= end_date)
-    
-    records = query.all()
-
-    # 🔧 BACKFILL legacy records (created before tax logic existed)
-    for r in records:
-        if r.tax_amount is None or r.total_amount is None:
-            compute_tax_for_record(r)
+    start_date, end_date = resolve_period(period, start_date, end_date)
 
-    db.commit()
-    return records
\ No newline at end of file
+    if transaction_type and transaction_type not in {"income", "expense"}:
+        raise HTTPException(status_code=400, detail="transaction_type must be income or expense")
+
+    filters = dict(
+        category=category,
+        transaction_type=transaction_type,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        tax_rate=tax_rate,
+    )
+
+    # Columnar clients (analytics) get an Arrow IPC stream instead of JSON
+    # (same filters; limit / cursor don't apply)
+    if ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", ""):
+        return arrow_stream_response(current_user.id, start_date, end_date, **filters)
+
+    # Bulk consumers can stream everything matching the filters as NDJSON
+    # (limit / cursor don't apply)
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return ndjson_stream_response(current_user.id, start_date, end_date, **filters)
+
+    # Newest first on (date, id). Paging is opt-in (limit / cursor) so
+    # clients that expect the full history keep getting it.
+    if cursor and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+
+    # Fast path: column tuples straight to JSON, no ORM entities and no
+    # per-row TaxRecordResponse validation
+    rows, next_cursor = select_record_rows(
+        db,
+        current_user.id,
+        start_date,
+        end_date,
+        cursor=cursor,
+        limit=limit,
+        **filters,
+    )
+
+    response = Response(content=encode_records_json(rows), media_type="application/json")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
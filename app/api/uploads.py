@@ -9,7 +9,11 @@ from fastapi import BackgroundTasks
 from app.core.database import SessionLocal
 from app.core.security import get_current_user
 from app.schemas.tax_record import TaxRecordCreate
+from app.services.categorization_service import NO_MATCH_CONFIDENCE, UNCATEGORIZED, suggest_categories
 from app.services.csv_import_service import parse_csv_rows
+from app.services.gst_rate_resolver import resolve_gst_rates
+from app.services.tax_calculator import taxable_from_total
+from app.services.cache_warming import request_dashboard_warmup
 from app.models.user import User
 from app.utils.parsers import parse_date
 
@@ -61,7 +65,8 @@ def preview_csv(
                 transaction_type=row["transaction_type"],
                 taxable_amount=float(row["taxable_amount"]),
                 tax_type=row.get("tax_type", "NONE"),
-                tax_rate=float(row.get("tax_rate", 0.0)) if row.get("tax_rate") else None
+                tax_rate=float(row.get("tax_rate", 0.0)) if row.get("tax_rate") else None,
+                hsn_code=(row.get("hsn_code") or row.get("hsn") or row.get("sac") or "").strip() or None,
             )
             records.append(record)
         except Exception as e:
@@ -109,6 +114,8 @@ def run_csv_import_background(user_id: int, records: list[TaxRecordCreate]):
     try:
         count = parse_csv_rows(db, user_id, records)
         print(f"DEBUG: Background task finished. Inserted {count} records.")
+        if count:
+            request_dashboard_warmup(user_id)
     except Exception as e:
         print(f"DEBUG: Error in background CSV import: {e}")
         import traceback
@@ -150,6 +157,7 @@ async def upload_invoices(
     
     results = []
     records_to_insert = []
+    invoice_parses = []  # (OCR text, parsed data) per record_to_insert
     
     for file in files:
         # Validate file type
@@ -220,10 +228,12 @@ async def upload_invoices(
                         category=parsed_data["category"],
                         transaction_type="expense", # Invoices are usually expenses
                         taxable_amount=parsed_data["amount"],
-                        tax_type="NONE",
-                        tax_rate=0.0
+                        tax_type=parsed_data["tax_type"],
+                        hsn_code=parsed_data["hsn_code"],
+                        # tax_rate left unset: resolved from HSN/SAC, category or tax_type
                     )
                     records_to_insert.append(record_create)
+                    invoice_parses.append((text, parsed_data))
                     results.append({
                         "filename": file.filename,
                         "status": "success",
@@ -250,10 +260,33 @@ async def upload_invoices(
                 "message": f"Processing failed: {str(e)}"
             })
     
+    # Categorize over the full OCR text, for the whole batch (the user's own
+    # history first); invoices with no suggestion keep the parser's default
+    # category. Either way the category is a guess, stored with its
+    # confidence so it is not learned from as a user's choice.
+    confidences = []
+    if records_to_insert:
+        suggestions = suggest_categories((text for text, _ in invoice_parses), db, current_user.id)
+        for record_create, (_, parsed_data), (category, confidence) in zip(records_to_insert, invoice_parses, suggestions):
+            if category != UNCATEGORIZED:
+                record_create.category = category
+                parsed_data["category"] = category
+                confidences.append(confidence)
+            else:
+                confidences.append(NO_MATCH_CONFIDENCE)
+
+        # The OCR'd amount is the invoice total; GST invoices carry tax
+        # inside it, so store the taxable value at the resolved rate
+        for record_create, (tax_rate, _) in zip(records_to_insert, resolve_gst_rates(records_to_insert)):
+            if tax_rate:
+                record_create.taxable_amount = taxable_from_total(record_create.taxable_amount, tax_rate)
+
     # Insert valid records
     inserted_count = 0
     if records_to_insert:
-        inserted_count = parse_csv_rows(db, current_user.id, records_to_insert)
+        inserted_count = parse_csv_rows(db, current_user.id, records_to_insert, confidences)
+        if inserted_count:
+            request_dashboard_warmup(current_user.id)
 
     return {
         "total_files": len(files),
@@ -274,7 +307,9 @@ def parse_invoice_text(text: str) -> dict:
         "date": None, # Format YYYY-MM-DD for consistency
         "description": None,
         "amount": None,
-        "category": "Office Expense" # Default
+        "category": "Office Expense", # Default
+        "tax_type": "NONE",
+        "hsn_code": None,
     }
     
     # Try to find date (various formats)
@@ -333,6 +368,14 @@ def parse_invoice_text(text: str) -> dict:
     if found_amounts:
         parsed["amount"] = max(found_amounts) # Assume largest amount found is Total
     
+    # GST invoices name the GSTIN or the tax heads; many also print the HSN/SAC code
+    if re.search(r'\b(?:GSTIN|CGST|SGST|IGST|UTGST|GST)\b', text, re.IGNORECASE):
+        parsed["tax_type"] = "GST"
+
+    hsn_match = re.search(r'\b(?:HSN|SAC)(?:\s*/\s*SAC)?(?:\s*code)?\s*[:#\-]?\s*(\d{4,8})\b', text, re.IGNORECASE)
+    if hsn_match:
+        parsed["hsn_code"] = hsn_match.group(1)
+
     # Description
     lines = [line.strip() for line in text.split('\n') if line.strip()]
     # Skip lines that look like dates or amounts only
@@ -5,7 +5,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.config import JWT_SECRET, JWT_ALGORITHM
+from app.config import JWT_SECRET, JWT_ALGORITHM, ADMIN_EMAILS
 from app.core.database import SessionLocal
 from app.models.user import User
 
@@ -71,4 +71,13 @@ def get_current_user(
     if user is None:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    return user
+
+
+def get_admin_user(current_user: User = Depends(get_current_user)):
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
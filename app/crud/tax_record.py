@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from app.models.tax_record import TaxRecord
 from app.schemas.tax_record import TaxRecordCreate
 from app.services.tax_calculator import compute_tax_for_record
+from app.services.rollup_service import apply_records_to_rollups
+from app.services.aggregate_deltas import begin_write, publish_write, record_contributions
+from app.services.user_category_index import category_samples
 
 
 def create_tax_record(
@@ -26,7 +29,12 @@ def create_tax_record(
     )
 
     db.add(record)
+    apply_records_to_rollups(db, user_id, [record])
+    contributions = record_contributions([record])
+    samples = category_samples([record])
+    token = begin_write(user_id)
     db.commit()
+    publish_write(user_id, token, contributions, samples)
     db.refresh(record)
     return record
 
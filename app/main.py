@@ -1,10 +1,19 @@
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api import tax_records, reports, auth, uploads, dashboard, tax_summary, erl
+from app.api import tax_records, reports, auth, uploads, dashboard, tax_summary, erl, admin
+from app.services.gst_rate_resolver import get_gst_rate_index
 
 
-app = FastAPI(title="Taxmate v0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load lookup tables once, before the first request needs them
+    get_gst_rate_index()
+    yield
+
+
+app = FastAPI(title="Taxmate v0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -17,6 +26,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.include_router(uploads.router)
@@ -26,6 +36,7 @@ app.include_router(auth.router)
 app.include_router(dashboard.router)
 app.include_router(tax_summary.router)
 app.include_router(erl.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def root():
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, UniqueConstraint
+from app.core.database import Base
+from app.utils.money import Paise
+
+
+class MonthlyRollup(Base):
+    """
+    Pre-aggregated tax_records, one row per
+    (user, month, category, transaction_type, tax_type, tax_rate).
+
+    Maintained in the same transaction as every insert into tax_records,
+    so period summaries read O(months x categories) rows instead of
+    every record.
+    """
+
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "month",
+            "category",
+            "transaction_type",
+            "tax_type",
+            "tax_rate",
+            name="uq_monthly_rollups_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    month = Column(Date, nullable=False)  # first day of the month
+
+    category = Column(String, nullable=False)
+    transaction_type = Column(String, nullable=False)
+    tax_type = Column(String, nullable=False, default="NONE")
+    tax_rate = Column(Float, nullable=False, default=0.0)
+
+    taxable_amount = Column(Paise, nullable=False, default=0.0)
+    tax_amount = Column(Paise, nullable=False, default=0.0)
+    total_amount = Column(Paise, nullable=False, default=0.0)
+    record_count = Column(Integer, nullable=False, default=0)
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.utils.money import Paise
 
 
 class TaxRecord(Base):
     __tablename__ = "tax_records"
+    __table_args__ = (
+        # Keyset pagination of GET /records/ on (date, id), per user
+        Index("ix_tax_records_user_date_id", "user_id", "date", "id"),
+        # One per listing filter, each ending in (date, id) so a filtered
+        # page is still a single index range scan. For the amount range the
+        # matching entries still need a sort, but the index covers the
+        # keyset condition.
+        Index("ix_tax_records_user_category_date_id", "user_id", "category", "date", "id"),
+        Index("ix_tax_records_user_type_date_id", "user_id", "transaction_type", "date", "id"),
+        Index("ix_tax_records_user_rate_date_id", "user_id", "tax_rate", "date", "id"),
+        Index("ix_tax_records_user_taxable_amount_date_id", "user_id", "taxable_amount", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -17,14 +30,20 @@ class TaxRecord(Base):
 
     transaction_type = Column(String, nullable=False)  # income | expense
 
-    taxable_amount = Column(Float, nullable=False)
+    # Money is stored as integer paise, read and written as rupees
+    taxable_amount = Column(Paise, nullable=False)
 
     # 🔑 NEW — REQUIRED
     tax_type = Column(String, nullable=False, default="NONE")
     tax_rate = Column(Float, nullable=False, default=0.0)
 
-    tax_amount = Column(Float, nullable=False, default=0.0)
-    total_amount = Column(Float, nullable=False, default=0.0)
+    # HSN (goods) / SAC (services) code, when known
+    hsn_code = Column(String, nullable=True)
+    # How tax_rate was obtained: provided | hsn | category | gst_default | no_gst
+    tax_rate_source = Column(String, nullable=True)
+
+    tax_amount = Column(Paise, nullable=False, default=0.0)
+    total_amount = Column(Paise, nullable=False, default=0.0)
 
     confidence_score = Column(Float, nullable=False, default=1.0)
 
@@ -19,3 +19,21 @@ class ERLInsights(BaseModel):
     
     monthly_burn_rate: float
     financial_health_score: int # 0-100 score based on rules
+
+
+class RollingERLMetrics(BaseModel):
+    window: int  # months
+    monthly_burn_rate: float
+    savings_rate: float  # Percentage
+    tax_efficiency: float  # Percentage
+
+class ERLMonthPoint(BaseModel):
+    month: str  # YYYY-MM
+    total_income: float
+    total_expenses: float
+    total_tax: float
+    rolling: List[RollingERLMetrics]
+
+class ERLTimeSeries(BaseModel):
+    windows: List[int]
+    points: List[ERLMonthPoint]
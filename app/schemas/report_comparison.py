@@ -0,0 +1,30 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PeriodSummary(BaseModel):
+    period: str
+    start_date: Optional[date]
+    end_date: Optional[date]
+    total_income: float
+    total_expense: float
+    estimated_tax: float
+
+
+class MetricDelta(BaseModel):
+    change: float
+    change_pct: Optional[float]  # None when the baseline is 0
+
+
+class PeriodDelta(BaseModel):
+    period: str
+    baseline: str
+    total_income: MetricDelta
+    total_expense: MetricDelta
+    estimated_tax: MetricDelta
+
+
+class PeriodComparisonResponse(BaseModel):
+    periods: List[PeriodSummary]
+    deltas: List[PeriodDelta]  # every period vs the first one
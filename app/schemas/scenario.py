@@ -0,0 +1,51 @@
+from pydantic import BaseModel, validator
+from typing import List, Optional
+
+MAX_SCENARIOS = 500
+
+
+class Scenario(BaseModel):
+    name: Optional[str] = None
+
+    # Applied to every month of the baseline: new = old * (1 + pct/100) + delta.
+    # Deltas apply even without history (a year of them).
+    income_change_pct: float = 0.0
+    expense_change_pct: float = 0.0
+    monthly_income_delta: float = 0.0   # e.g. +25000 for a new retainer
+    monthly_expense_delta: float = 0.0  # e.g. +10000 when rent goes up
+
+    @validator("income_change_pct", "expense_change_pct")
+    def validate_pct(cls, v):
+        if v < -100:
+            raise ValueError("change_pct cannot be below -100")
+        return v
+
+
+class ScenarioRequest(BaseModel):
+    scenarios: List[Scenario]
+
+    @validator("scenarios")
+    def validate_scenarios(cls, v):
+        if not v:
+            raise ValueError("at least one scenario is required")
+        if len(v) > MAX_SCENARIOS:
+            raise ValueError(f"at most {MAX_SCENARIOS} scenarios per request")
+        return v
+
+
+class ScenarioResult(BaseModel):
+    name: Optional[str]
+    projected_income: float     # annual
+    projected_expenses: float   # annual
+    projected_income_tax: float
+    projected_gst: float
+    projected_tax: float
+    savings_rate: float  # Percentage
+    tax_efficiency: float  # Percentage
+    financial_health_score: int
+
+
+class ScenarioResponse(BaseModel):
+    months_used: int  # trailing months of history the baseline is built from
+    baseline: ScenarioResult
+    scenarios: List[ScenarioResult]
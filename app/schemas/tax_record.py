@@ -18,6 +18,9 @@ class TaxRecordBase(BaseModel):
     # ⚠️ legacy (kept for backward compatibility)
     tax_type: Optional[str] = None    # GST | NONE (deprecated)
 
+    # HSN / SAC code, used to look up the GST rate when tax_rate is missing
+    hsn_code: Optional[str] = None
+
     @validator("transaction_type")
     def validate_transaction_type(cls, v):
         if v not in {"income", "expense"}:
@@ -26,8 +29,9 @@ class TaxRecordBase(BaseModel):
 
     @validator("tax_rate")
     def validate_tax_rate(cls, v):
+        # None is kept: the rate is resolved when the record is saved
         if v is None:
-            return 0.0
+            return None
         if v < 0 or v > 100:
             raise ValueError("tax_rate must be between 0 and 100")
         return v
@@ -50,6 +54,11 @@ class TaxRecordResponse(TaxRecordBase):
     tax_amount: float
     total_amount: float
     confidence_score: float
+    tax_rate_source: Optional[str] = None
+
+    @validator("tax_rate", always=True)
+    def default_tax_rate(cls, v):
+        return 0.0 if v is None else v
 
     class Config:
         orm_mode = True
\ No newline at end of file
@@ -0,0 +1,25 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import List
+
+
+class RegimeLiability(BaseModel):
+    regime: str
+    is_default: bool  # the regime that applies unless the taxpayer opts out
+    slab_tax: float
+    rebate: float  # section 87A
+    cess: float
+    income_tax: float
+    total_tax: float  # income tax + GST
+    effective_rate: float  # income tax as % of income
+
+
+class RegimeComparisonResponse(BaseModel):
+    fy: str
+    start_date: date
+    end_date: date
+    total_income: float
+    total_expense: float
+    gst_tax: float
+    regimes: List[RegimeLiability]
+    recommended_regime: str  # lowest income tax
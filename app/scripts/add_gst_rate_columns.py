@@ -0,0 +1,30 @@
+"""
+Add tax_records.hsn_code and tax_records.tax_rate_source on an existing
+database. Safe to re-run. Existing rows keep NULL in both.
+
+    python -m app.scripts.add_gst_rate_columns
+"""
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+
+NEW_COLUMNS = ("hsn_code", "tax_rate_source")
+
+
+def main():
+    print("ENGINE:", engine.url)
+
+    with engine.begin() as conn:
+        existing = {c["name"] for c in inspect(conn).get_columns("tax_records")}
+        for column in NEW_COLUMNS:
+            if column in existing:
+                print("SKIP:", column)
+                continue
+            conn.execute(text(f"ALTER TABLE tax_records ADD COLUMN {column} VARCHAR"))
+            print("OK:", column)
+
+    print("DONE")
+
+
+if __name__ == "__main__":
+    main()
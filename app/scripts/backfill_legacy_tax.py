@@ -0,0 +1,37 @@
+"""
+One-off migration: fill tax_rate / tax_amount / total_amount on tax_records
+rows created before tax logic existed. Safe to re-run.
+
+    python -m app.scripts.backfill_legacy_tax
+    python -m app.scripts.backfill_legacy_tax --chunk-size 20000
+"""
+import argparse
+import logging
+
+from app.core.database import SessionLocal, engine
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+from app.models.monthly_rollup import MonthlyRollup
+from app.services.legacy_backfill_service import BACKFILL_CHUNK_SIZE, backfill_legacy_tax
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill tax fields on legacy tax_records rows")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE)
+    args = parser.parse_args()
+    # Per-chunk progress is logged by the service
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    print("ENGINE:", engine.url)
+    MonthlyRollup.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        updated = backfill_legacy_tax(db, args.chunk_size)
+        print(f"DONE: backfilled {updated} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
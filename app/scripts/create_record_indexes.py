@@ -0,0 +1,30 @@
+"""
+Create the tax_records indexes used by GET /records/ pagination and
+filters on an existing database. Safe to re-run.
+
+    python -m app.scripts.create_record_indexes
+"""
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+
+# Replaced by an index of the same columns plus (date, id)
+OBSOLETE_INDEXES = ("ix_tax_records_user_taxable_amount",)
+
+
+def main():
+    print("ENGINE:", engine.url)
+
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    for index in TaxRecord.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+        print("OK:", index.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+One-off migration: store tax_records money columns as BIGINT paise instead
+of floating-point rupees. Safe to re-run; an interrupted run resumes.
+
+    python -m app.scripts.migrate_money_to_paise
+    python -m app.scripts.migrate_money_to_paise --chunk-size 20000
+
+1. adds taxable_amount_paise / tax_amount_paise / total_amount_paise
+2. fills them in id-range chunks, one short transaction each
+3. in one transaction: converts rows written meanwhile, drops the float
+   columns and renames the paise ones into place
+4. recreates monthly_rollups with paise sums and rebuilds it
+
+Step 4 checks monthly_rollups on its own and runs on every invocation, so
+a run that died after the swap (3) but before or during the rebuild still
+leaves correct rollups after the next run.
+
+Rows with NULL tax fields keep them NULL; run
+`python -m app.scripts.backfill_legacy_tax` afterwards to fill them.
+"""
+import argparse
+
+from sqlalchemy import inspect, text
+
+from app.core.database import SessionLocal, engine
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+from app.models.monthly_rollup import MonthlyRollup
+from app.services.rollup_service import rebuild_rollups
+
+MONEY_COLUMNS = ("taxable_amount", "tax_amount", "total_amount")
+DEFAULT_CHUNK_SIZE = 10000
+
+# Indexes that include a money column must be dropped before the swap
+MONEY_INDEXES = ("ix_tax_records_user_taxable_amount", "ix_tax_records_user_taxable_amount_date_id")
+
+
+def _to_paise(column: str) -> str:
+    # Through NUMERIC so half-paisa rounds up, like rupees_to_paise
+    return f"CAST(ROUND(CAST({column} AS NUMERIC) * 100) AS BIGINT)"
+
+
+def _columns(conn, table: str = "tax_records") -> dict:
+    return {c["name"]: c["type"] for c in inspect(conn).get_columns(table)}
+
+
+def _stores_paise(column_type) -> bool:
+    return "INT" in str(column_type).upper()
+
+
+def already_migrated(conn) -> bool:
+    columns = _columns(conn)
+    return "taxable_amount_paise" not in columns and _stores_paise(columns["taxable_amount"])
+
+
+def rollups_migrated(conn) -> bool:
+    """monthly_rollups exists with paise sums (checked apart from tax_records)."""
+    if not inspect(conn).has_table("monthly_rollups"):
+        return False
+    return _stores_paise(_columns(conn, "monthly_rollups")["taxable_amount"])
+
+
+def add_paise_columns() -> None:
+    with engine.begin() as conn:
+        existing = _columns(conn)
+        for column in MONEY_COLUMNS:
+            if f"{column}_paise" not in existing:
+                conn.execute(text(f"ALTER TABLE tax_records ADD COLUMN {column}_paise BIGINT"))
+
+
+def _fill_sql(where: str) -> str:
+    assignments = ", ".join(f"{c}_paise = {_to_paise(c)}" for c in MONEY_COLUMNS)
+    return f"UPDATE tax_records SET {assignments} WHERE {where} AND taxable_amount_paise IS NULL"
+
+
+def fill_in_chunks(chunk_size: int) -> int:
+    with engine.connect() as conn:
+        low, high = conn.execute(text("SELECT MIN(id), MAX(id) FROM tax_records")).one()
+    if low is None:
+        return 0
+
+    filled = 0
+    sql = text(_fill_sql("id >= :low AND id < :high"))
+    for chunk_start in range(low, high + 1, chunk_size):
+        with engine.begin() as conn:
+            filled += conn.execute(sql, {"low": chunk_start, "high": chunk_start + chunk_size}).rowcount
+        print(f"DEBUG: converted ids {chunk_start}..{chunk_start + chunk_size - 1}, {filled} rows so far")
+    return filled
+
+
+def swap_columns() -> None:
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if dialect == "postgresql":
+            # Blocks writers (not readers) for the few statements below
+            conn.execute(text("LOCK TABLE tax_records IN SHARE ROW EXCLUSIVE MODE"))
+
+        # Rows inserted while the chunks ran
+        conn.execute(text(_fill_sql("1 = 1")))
+
+        for index in MONEY_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+        for column in MONEY_COLUMNS:
+            conn.execute(text(f"ALTER TABLE tax_records DROP COLUMN {column}"))
+            conn.execute(text(f"ALTER TABLE tax_records RENAME COLUMN {column}_paise TO {column}"))
+
+        if dialect == "postgresql":
+            for column in MONEY_COLUMNS:
+                conn.execute(text(f"ALTER TABLE tax_records ALTER COLUMN {column} SET DEFAULT 0"))
+            conn.execute(text("ALTER TABLE tax_records ALTER COLUMN taxable_amount SET NOT NULL"))
+
+    for index in TaxRecord.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def rebuild_rollup_table() -> int:
+    # Derived data: cheaper to recreate with BIGINT sums than to convert
+    with engine.connect() as conn:
+        recreate = not rollups_migrated(conn)
+    if recreate:
+        MonthlyRollup.__table__.drop(bind=engine, checkfirst=True)
+        MonthlyRollup.__table__.create(bind=engine)
+
+    db = SessionLocal()
+    try:
+        return rebuild_rollups(db)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert tax_records money columns to integer paise")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print("ENGINE:", engine.url)
+
+    with engine.connect() as conn:
+        records_done = already_migrated(conn)
+
+    if records_done:
+        print("OK: tax_records already stores paise")
+    else:
+        add_paise_columns()
+        converted = fill_in_chunks(args.chunk_size)
+        swap_columns()
+        print(f"OK: converted {converted} rows")
+
+    written = rebuild_rollup_table()
+    print(f"DONE: rebuilt {written} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
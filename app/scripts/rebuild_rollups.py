@@ -0,0 +1,33 @@
+"""
+Backfill / repair monthly_rollups from tax_records.
+
+    python -m app.scripts.rebuild_rollups              # every user
+    python -m app.scripts.rebuild_rollups --user-id 7  # one user
+"""
+import argparse
+
+from app.core.database import SessionLocal, engine
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+from app.models.monthly_rollup import MonthlyRollup
+from app.services.rollup_service import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild monthly_rollups from tax_records")
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    print("ENGINE:", engine.url)
+    MonthlyRollup.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        written = rebuild_rollups(db, args.user_id)
+        print(f"DONE: wrote {written} rollup rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
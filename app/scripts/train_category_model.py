@@ -0,0 +1,35 @@
+"""
+Train the naive Bayes category model from users' categorized records and
+write it to CATEGORY_MODEL_PATH (workers pick it up on their next batch).
+
+    python -m app.scripts.train_category_model
+    python -m app.scripts.train_category_model --output /srv/models/category_nb.npy
+"""
+import argparse
+
+from app.config import CATEGORY_MODEL_PATH
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+from app.services.category_model import train_category_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the transaction category model")
+    parser.add_argument("--output", default=CATEGORY_MODEL_PATH)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = train_category_model(db, args.output)
+    finally:
+        db.close()
+
+    if result["trained"]:
+        print(f"DONE: {result['samples']} records, {result['categories']} categories -> {args.output}")
+    else:
+        print(f"DONE: not enough data ({result['samples']} records, {result['categories']} categories)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from typing import Iterable, List, Optional, Tuple
+
+from app.models.tax_record import TaxRecord
+from app.services.cache import bump_data_version
+from app.utils.money import add_rupees
+
+# Sums that drift below this after a negative delta are treated as empty
+EPSILON = 0.005
+
+
+def record_contributions(records: Iterable[TaxRecord], sign: int = 1) -> List[list]:
+    """
+    What each record adds to (sign=1) or removes from (sign=-1) the cached
+    aggregates: [date_iso, transaction_type, category, taxable, tax, sign].
+
+    Must be called BEFORE the commit — afterwards the ORM objects are
+    expired and every attribute access would reload the row.
+    """
+    return [
+        [
+            r.date.isoformat(),
+            r.transaction_type,
+            r.category,
+            sign * (r.taxable_amount or 0.0),
+            sign * (r.tax_amount or 0.0),
+            sign,
+        ]
+        for r in records
+    ]
+
+
+def apply_to_partials(
+    partials: dict,
+    contributions: List[list],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> bool:
+    """
+    Applies contributions falling inside [start, end] (ISO dates, None for
+    open ends) to {"YYYY-MM": partial} in place.
+
+    Returns False when the result is inconsistent (a sum went negative),
+    in which case the aggregate must be rebuilt instead.
+    """
+    for day, transaction_type, category, taxable, tax, sign in contributions:
+        if (start and day < start) or (end and day > end):
+            continue
+
+        p = partials.setdefault(day[:7], {"income": {}, "expense": {}, "tax": 0.0})
+
+        if transaction_type in ("income", "expense"):
+            amount = add_rupees(p[transaction_type].get(category), taxable)
+            if amount < -EPSILON:
+                return False
+            if sign < 0 and abs(amount) < EPSILON:
+                p[transaction_type].pop(category, None)
+            else:
+                p[transaction_type][category] = amount
+
+        p["tax"] = add_rupees(p["tax"], tax)
+        if p["tax"] < -EPSILON:
+            return False
+
+    return True
+
+
+def begin_write(user_id: int) -> int:
+    """
+    Call before committing a write. Bumping the version up front means any
+    aggregate whose build overlaps the commit is never stored (builders
+    re-check the version), so deltas are only applied to aggregates that
+    definitely exclude this write.
+    """
+    return bump_data_version(user_id)
+
+
+def publish_write(
+    user_id: int,
+    token: int,
+    contributions: List[list],
+    category_samples: Optional[List[Tuple[str, str]]] = None,
+) -> None:
+    """
+    Call after the commit. Carries the user's cached dashboards from the
+    version before begin_write() to a fresh version with the write's
+    contributions applied, so they stay warm through a stream of writes.
+    (ERL inputs are cheap SQL aggregates and are simply recomputed.)
+    The user's category index is carried the same way with
+    `category_samples` (see user_category_index.category_samples).
+
+    If another write interleaved, nothing is carried: those aggregates are
+    simply rebuilt on the next read.
+    """
+    from app.services.dashboard_cache import carry_forward_dashboards
+    from app.services.user_category_index import carry_forward_category_index
+
+    new_version = bump_data_version(user_id)
+    if new_version != token + 1:
+        return
+
+    old_version = token - 1
+    if category_samples:
+        carry_forward_category_index(user_id, old_version, new_version, category_samples)
+    if contributions:
+        carry_forward_dashboards(user_id, old_version, new_version, contributions)
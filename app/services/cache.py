@@ -0,0 +1,109 @@
+import threading
+from typing import Any, Dict, Optional
+
+import msgpack
+
+from app.services.cache_backends import CacheBackend, create_backend
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+# Every NamespacedCache registers itself here so /admin/cache/stats can list them
+_registry: Dict[str, "NamespacedCache"] = {}
+
+
+def get_backend() -> CacheBackend:
+    """The process-wide backend, created lazily from CACHE_BACKEND."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+# Per-user data version, bumped by every write path. Cache keys include it,
+# so a write makes all of that user's cached entries unreachable at once —
+# in every worker, since the counter lives in the shared backend.
+def get_data_version(user_id: int) -> int:
+    return get_backend().get_counter(f"version:{user_id}")
+
+
+def bump_data_version(user_id: int) -> int:
+    return get_backend().incr_counter(f"version:{user_id}")
+
+
+def _make_key(name: str, key) -> str:
+    if isinstance(key, tuple):
+        return name + ":" + ":".join(str(part) for part in key)
+    return f"{name}:{key}"
+
+
+class NamespacedCache:
+    """
+    A named view on the shared backend. Values are msgpack-encoded, so
+    they must be plain dicts/lists/str/numbers; every get returns a fresh
+    copy.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+
+        # Lookups served by this worker
+        self.hits = 0
+        self.misses = 0
+
+        _registry[name] = self
+
+    def get(self, key) -> Optional[Any]:
+        raw = get_backend().get(_make_key(self.name, key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+    def set(self, key, value: Any) -> None:
+        get_backend().set(
+            _make_key(self.name, key),
+            msgpack.packb(value, use_bin_type=True),
+            self.ttl_seconds,
+        )
+
+    def get_bytes(self, key) -> Optional[bytes]:
+        """Like get(), for values that are already bytes (no msgpack round trip)."""
+        raw = get_backend().get(_make_key(self.name, key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return raw
+
+    def set_bytes(self, key, value: bytes) -> None:
+        get_backend().set(_make_key(self.name, key), value, self.ttl_seconds)
+
+    def delete(self, key) -> None:
+        get_backend().delete(_make_key(self.name, key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_stats() -> dict:
+    return {
+        "backend": get_backend().stats(),
+        "caches": [cache.stats() for cache in _registry.values()],
+    }
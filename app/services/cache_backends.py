@@ -0,0 +1,370 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import (
+    CACHE_BACKEND,
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_REDIS_URL,
+    CACHE_SQLITE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Byte-oriented key/value store behind every application cache.
+
+    Values are opaque bytes (callers serialize), keys are strings.
+    Counters (per-user data versions) live alongside the entries but are
+    never evicted or expired.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    def incr_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process LRU with TTL, an entry cap and a byte cap.
+    Only shared by the threads of one worker.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._bytes += len(value)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr_counter(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk cache shared by every worker on one host.
+
+    Uses WAL mode so readers never block the (short) writes. LRU order is
+    tracked with an accessed_at column; entry/byte caps are enforced on
+    write, and eviction counters are stored in the file so every worker
+    reports the same numbers.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str = CACHE_SQLITE_PATH,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        timeout: float = 5.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self._conn().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Entries are disposable: a locked or busy database (another worker
+    # holding the write lock past the timeout) makes get() a miss and
+    # set()/delete() a no-op instead of failing the request. Counters are
+    # not covered -- a lost version bump would serve stale data.
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("sqlite cache read failed, treating as miss: %s", e)
+            return None
+        if row is None:
+            return None
+
+        now = time.time()
+        try:
+            if row[1] <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bump_stat(conn, "stat:expirations", 1)
+                return None
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            # Only the LRU bookkeeping failed; expiry is re-checked on the next read
+            logger.warning("sqlite cache bookkeeping failed: %s", e)
+            if row[1] <= now:
+                return None
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            logger.warning("sqlite cache write skipped: %s", e)
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + ttl_seconds, now),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            logger.warning("sqlite cache write skipped: %s", e)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        evicted = 0
+        while count > self.max_entries or size > self.max_bytes:
+            batch = max(count - self.max_entries, 1)
+            victims = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (batch,)
+            ).fetchall()
+            if not victims:
+                break
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+            count -= len(victims)
+            size -= sum(s for _, s in victims)
+            evicted += len(victims)
+
+        if evicted:
+            self._bump_stat(conn, "stat:evictions", evicted)
+
+    def _bump_stat(self, conn: sqlite3.Connection, key: str, by: int) -> None:
+        conn.execute(
+            "INSERT INTO counters (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, by),
+        )
+
+    def delete(self, key: str) -> None:
+        # Keys carry the data version, so a missed delete only leaves an
+        # unreachable entry behind for LRU eviction
+        try:
+            self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning("sqlite cache delete skipped: %s", e)
+
+    def get_counter(self, key: str) -> int:
+        row = self._conn().execute(
+            "SELECT value FROM counters WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr_counter(self, key: str) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._bump_stat(conn, key, 1)
+            value = conn.execute(
+                "SELECT value FROM counters WHERE key = ?", (key,)
+            ).fetchone()[0]
+            conn.execute("COMMIT")
+            return value
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "entries": count,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.get_counter("stat:evictions"),
+            "expirations": self.get_counter("stat:expirations"),
+        }
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-protocol backend shared by every worker and node.
+
+    TTLs are native; size bounds and LRU eviction are Redis' own
+    (maxmemory + maxmemory-policy volatile-lru keeps the TTL-less version
+    counters safe from eviction). `client` may be any redis-py compatible
+    object, e.g. fakeredis.FakeRedis() as a local stand-in.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client=None, prefix: str = "taxmate:"):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+    def incr_counter(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def stats(self) -> dict:
+        try:
+            info = self.client.info()
+        except Exception:
+            # Some stand-ins (fakeredis) don't implement INFO
+            info = {}
+        return {
+            "backend": self.name,
+            "entries": self.client.dbsize(),
+            "bytes": info.get("used_memory"),
+            "max_bytes": info.get("maxmemory"),
+            "evictions": info.get("evicted_keys"),
+            "expirations": info.get("expired_keys"),
+        }
+
+
+def create_backend(kind: str = CACHE_BACKEND) -> CacheBackend:
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend()
+    if kind == "redis":
+        return RedisBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
@@ -0,0 +1,45 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.database import SessionLocal
+from app.services.dashboard_cache import warm_dashboard_cache
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-warm")
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def request_dashboard_warmup(user_id: int) -> bool:
+    """
+    Schedules a dashboard rebuild for `user_id` after a write, so the next
+    dashboard load is a cache hit.
+
+    At most one warm-up per user is queued at a time; returns False when
+    one is already pending. Safe to call from request handlers and from
+    background tasks alike.
+    """
+    with _pending_lock:
+        if user_id in _pending:
+            return False
+        _pending.add(user_id)
+
+    _executor.submit(_warm_dashboard, user_id)
+    return True
+
+
+def _warm_dashboard(user_id: int) -> None:
+    # Never reuse a request-scoped session: it is closed by the time we run
+    db = SessionLocal()
+    try:
+        # Un-mark first so a write landing during the build queues a fresh warm-up
+        with _pending_lock:
+            _pending.discard(user_id)
+        warm_dashboard_cache(db, user_id)
+    except Exception:
+        logger.exception("Dashboard warm-up failed for user %s", user_id)
+    finally:
+        db.close()
@@ -1,12 +1,115 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
 KEYWORDS = {
     "food": ["zomato", "swiggy", "restaurant"],
     "shopping": ["amazon", "flipkart"],
     "travel": ["uber", "ola", "flight"]
 }
 
-def suggest_category(text: str):
-    text = text.lower()
-    for category, words in KEYWORDS.items():
-        if any(word in text for word in words):
-            return category, 0.8
-    return "uncategorized", 0.4
\ No newline at end of file
+UNCATEGORIZED = "uncategorized"
+MATCH_CONFIDENCE = 0.8
+NO_MATCH_CONFIDENCE = 0.4
+
+# Model predictions below this fall through to the keyword rules
+MIN_MODEL_CONFIDENCE = 0.6
+
+
+def _build_matcher(keywords: dict):
+    """
+    One compiled pattern for the whole table. Each alternative sits in a
+    lookahead, so every start position is tried and overlapping keywords
+    are all seen in a single scan. Alternatives are ordered by category
+    (table order) so, at any position, the earliest category wins, just
+    as in the original category-by-category loop.
+    """
+    category_of = {}
+    alternatives = []
+    for priority, (category, words) in enumerate(keywords.items()):
+        for word in sorted(words, key=len, reverse=True):
+            word = word.lower()
+            if word not in category_of:
+                category_of[word] = (priority, category)
+                alternatives.append(re.escape(word))
+
+    pattern = re.compile("(?=(" + "|".join(alternatives) + "))")
+    return pattern, category_of
+
+
+_PATTERN, _CATEGORY_OF = _build_matcher(KEYWORDS)
+
+
+def match_keyword_category(text: str) -> Optional[str]:
+    """The first category in KEYWORDS with a keyword in `text`, or None."""
+    best = None
+    for m in _PATTERN.finditer(text.lower()):
+        priority, category = _CATEGORY_OF[m.group(1)]
+        if best is None or priority < best[0]:
+            best = (priority, category)
+            if priority == 0:
+                break
+    return best[1] if best else None
+
+
+def _user_confidence(share: float) -> float:
+    # Unanimous history beats a global keyword match
+    return round(0.5 + 0.45 * share, 2)
+
+
+def suggest_category(text: str, db: Optional[Session] = None, user_id: Optional[int] = None):
+    """
+    With db and user_id, the user's own history (user_category_index) is
+    consulted first. Then the trained naive Bayes model (category_model),
+    when it is confident enough, and finally the global KEYWORDS rules.
+    """
+    return suggest_categories([text], db, user_id)[0]
+
+
+def suggest_categories(
+    texts: Iterable[str],
+    db: Optional[Session] = None,
+    user_id: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """
+    suggest_category for a whole import: the user's index is fetched once
+    and the model scores all remaining texts in one batch.
+    """
+    from app.services.category_model import get_category_model
+
+    texts = [text or "" for text in texts]
+    results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+
+    if db is not None and user_id is not None:
+        from app.services.user_category_index import get_user_category_index
+
+        user_index = get_user_category_index(db, user_id)
+        for i, text in enumerate(texts):
+            learned = user_index.lookup(text)
+            if learned is not None:
+                category, share = learned
+                results[i] = (category, _user_confidence(share))
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    model = get_category_model() if pending else None
+    if model is not None:
+        predictions = model.predict([texts[i] for i in pending])
+        for i, predicted in zip(pending, predictions):
+            if predicted is not None and predicted[1] >= MIN_MODEL_CONFIDENCE:
+                results[i] = predicted
+
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            category = match_keyword_category(text)
+            if category is not None:
+                results[i] = (category, MATCH_CONFIDENCE)
+            else:
+                results[i] = (UNCATEGORIZED, NO_MATCH_CONFIDENCE)
+    return results
+
+
+def needs_category(category: Optional[str]) -> bool:
+    """Empty or 'uncategorized' categories are filled in on import."""
+    category = (category or "").strip().lower()
+    return not category or category == UNCATEGORIZED
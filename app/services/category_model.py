@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import CATEGORY_MODEL_PATH
+from app.core.database import SessionLocal
+from app.models.tax_record import TaxRecord
+from app.services.user_category_index import description_tokens, user_chosen_clause
+
+logger = logging.getLogger(__name__)
+
+# Hashed token features (the model is a (N_FEATURES + 1, classes) float32 array)
+N_FEATURES = 2 ** 16
+MAX_CLASSES = 64
+MIN_CLASS_SAMPLES = 3
+SMOOTHING = 1.0
+
+# Predictions are capped below USER_CHOSEN_CONFIDENCE so they are never
+# mistaken for a user's own choice (see user_category_index)
+MAX_MODEL_CONFIDENCE = 0.95
+
+
+def hashed_features(text: str, n_features: int = N_FEATURES) -> Counter:
+    """feature id -> count. crc32, not hash(): ids must agree across processes."""
+    return Counter(zlib.crc32(token.encode()) % n_features for token in description_tokens(text))
+
+
+class CategoryModel:
+    """
+    Multinomial naive Bayes over hashed description tokens.
+
+    `weights` row 0 holds the class log priors and row f + 1 the log
+    probability of feature f under each class, so a document's scores are
+    prior + counts @ weights[1:] -- for a batch, one sparse (docs x
+    features) by dense (features x classes) product.
+    """
+
+    def __init__(self, weights: np.ndarray, categories: List[str]):
+        self.weights = weights
+        self.categories = categories
+        self.n_features = weights.shape[0] - 1
+        # A feature never seen in training has only the smoothing mass:
+        # the smallest log probability in every class
+        self._unseen = weights[1:].min(axis=0)
+
+    def predict(self, texts: Sequence[str]) -> List[Optional[Tuple[str, float]]]:
+        """(category, confidence) per text, None when no token was seen in training."""
+        # CSR layout of the batch's feature counts
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            features = hashed_features(text, self.n_features)
+            indices.extend(features.keys())
+            counts.extend(features.values())
+            indptr.append(len(indices))
+
+        results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        if not indices:
+            return results
+
+        indptr = np.asarray(indptr)
+        starts = indptr[:-1]
+        has_features = starts < indptr[1:]
+
+        # Sparse x dense: gather the touched feature rows (from the memory
+        # map) and sum them per document
+        gathered = self.weights[np.asarray(indices) + 1]
+        rows = gathered * np.asarray(counts, dtype=np.float32)[:, None]
+        scores = np.add.reduceat(rows, starts[has_features], axis=0) + self.weights[0]
+        seen = np.logical_or.reduceat((gathered > self._unseen).any(axis=1), starts[has_features])
+
+        # Posterior of the best class (softmax over log scores)
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        confidence = np.minimum(probs[np.arange(len(best)), best], MAX_MODEL_CONFIDENCE)
+
+        for i, known, b, conf in zip(
+            np.flatnonzero(has_features).tolist(), seen.tolist(), best.tolist(), confidence.tolist()
+        ):
+            if known:
+                results[i] = (self.categories[b], round(conf, 2))
+        return results
+
+
+# The model file is the weights as .npy, then the metadata as JSON, then
+# the JSON's byte length: one artifact, replaced in one rename
+_TRAILER_LENGTH = struct.Struct("<Q")
+
+
+def write_model_file(path: str, weights: np.ndarray, metadata: dict) -> None:
+    """Writes next to `path` and renames, so readers never see half a file
+    (and an existing memory map keeps the old inode)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    trailer = json.dumps(metadata).encode()
+    with open(tmp_path, "wb") as f:
+        np.lib.format.write_array(f, weights)
+        f.write(trailer)
+        f.write(_TRAILER_LENGTH.pack(len(trailer)))
+    os.replace(tmp_path, path)
+
+
+def read_model_file(path: str) -> Tuple[np.ndarray, dict]:
+    """(weights memory-mapped read-only, metadata), both from one open of the file."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+        f.seek(-_TRAILER_LENGTH.size, os.SEEK_END)
+        (length,) = _TRAILER_LENGTH.unpack(f.read(_TRAILER_LENGTH.size))
+        f.seek(-_TRAILER_LENGTH.size - length, os.SEEK_END)
+        metadata = json.loads(f.read(length))
+
+        weights = np.memmap(
+            f, dtype=dtype, mode="r", shape=shape, offset=offset,
+            order="F" if fortran_order else "C",
+        )
+    return weights, metadata
+
+
+_model: Optional[CategoryModel] = None
+_model_stamp: Optional[Tuple[int, int]] = None
+_model_lock = threading.Lock()
+
+
+def get_category_model() -> Optional[CategoryModel]:
+    """
+    The trained model, memory-mapped (read-only, pages shared by every
+    worker on the host). Reloaded when the training job replaces the file;
+    None until a model has been trained.
+    """
+    global _model, _model_stamp
+    try:
+        st = os.stat(CATEGORY_MODEL_PATH)
+    except FileNotFoundError:
+        return None
+    # A replaced file is a new inode
+    stamp = (st.st_ino, st.st_mtime_ns)
+
+    with _model_lock:
+        if _model is None or stamp != _model_stamp:
+            try:
+                weights, metadata = read_model_file(CATEGORY_MODEL_PATH)
+                categories = metadata["categories"]
+            except (OSError, ValueError, KeyError, struct.error) as e:
+                logger.warning("Category model not loaded: %s", e)
+                return _model
+
+            _model = CategoryModel(weights, categories)
+            _model_stamp = stamp
+            logger.info("Loaded category model with %d categories", len(categories))
+        return _model
+
+
+def train_category_model(db: Session, model_path: str = CATEGORY_MODEL_PATH) -> dict:
+    """
+    Fits the model on every (description, category) pair users chose
+    themselves, read with one grouped query, and atomically replaces the
+    model file (weights and metadata together). Categories are grouped case-insensitively and each class
+    is labelled with its most common spelling; the MAX_CLASSES most common
+    with at least MIN_CLASS_SAMPLES records are kept.
+    """
+    category = func.trim(TaxRecord.category)
+    grouped = db.execute(
+        select(TaxRecord.description, category, func.count())
+        .where(user_chosen_clause())
+        .group_by(TaxRecord.description, category)
+    ).all()
+
+    spellings = {}
+    rows = []
+    for description, spelling, n in grouped:
+        c = spelling.lower()
+        spellings.setdefault(c, Counter())[spelling] += n
+        rows.append((description, c, n))
+
+    class_samples = Counter()
+    for _, c, n in rows:
+        class_samples[c] += n
+    classes = [c for c, n in class_samples.most_common(MAX_CLASSES) if n >= MIN_CLASS_SAMPLES]
+    if len(classes) < 2:
+        return {"trained": False, "samples": sum(class_samples.values()), "categories": len(classes)}
+    categories = [spellings[c].most_common(1)[0][0] for c in classes]
+
+    class_of = {c: i for i, c in enumerate(classes)}
+    feature_ids, class_ids, weights = [], [], []
+    for description, c, n in rows:
+        k = class_of.get(c)
+        if k is None:
+            continue
+        for feature, count in hashed_features(description).items():
+            feature_ids.append(feature)
+            class_ids.append(k)
+            weights.append(count * n)
+
+    feature_counts = np.zeros((N_FEATURES, len(categories)))
+    np.add.at(feature_counts, (np.asarray(feature_ids, dtype=np.int64), np.asarray(class_ids, dtype=np.int64)), weights)
+
+    priors = np.array([class_samples[c] for c in classes], dtype=float)
+    model = np.empty((N_FEATURES + 1, len(categories)), dtype=np.float32)
+    model[0] = np.log(priors / priors.sum())
+    model[1:] = np.log(
+        (feature_counts + SMOOTHING) / (feature_counts.sum(axis=0) + SMOOTHING * N_FEATURES)
+    )
+
+    samples = int(priors.sum())
+    metadata = {
+        "categories": categories,
+        "n_features": N_FEATURES,
+        "samples": samples,
+        "trained_at": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+    write_model_file(model_path, model, metadata)
+
+    logger.info("Trained category model on %d records, %d categories", samples, len(categories))
+    return {"trained": True, "samples": samples, "categories": len(categories)}
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="category-model")
+_training = False
+_training_lock = threading.Lock()
+
+
+def request_model_training() -> bool:
+    """Schedules a training run in the background; False if one is already queued or running."""
+    global _training
+    with _training_lock:
+        if _training:
+            return False
+        _training = True
+
+    _executor.submit(_train_in_background)
+    return True
+
+
+def _train_in_background() -> None:
+    global _training
+    db = SessionLocal()
+    try:
+        train_category_model(db)
+    except Exception:
+        logger.exception("Category model training failed")
+    finally:
+        db.close()
+        with _training_lock:
+            _training = False
@@ -1,6 +1,17 @@
+import logging
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from app.schemas.tax_record import TaxRecordCreate
 from app.models.tax_record import TaxRecord
+from app.services.categorization_service import needs_category, suggest_categories
+from app.services.gst_rate_resolver import resolve_gst_rates
+from app.services.rollup_service import apply_records_to_rollups
+from app.services.tax_calculator import compute_tax_amounts
+from app.services.user_category_index import USER_CHOSEN_CONFIDENCE, category_samples
+from app.services.aggregate_deltas import begin_write, publish_write, record_contributions
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -8,18 +19,39 @@ def parse_csv_rows(
     db: Session,
     user_id: int,
     rows: list[TaxRecordCreate],
+    confidences: Optional[list[float]] = None,
 ) -> int:
     """
     Takes validated CSV rows from preview,
     deduplicates them, computes tax,
     and inserts safely into DB.
+
+    Rows with an empty or "uncategorized" category are categorized from
+    their description, then missing tax rates are resolved (HSN/SAC code,
+    then category, then tax_type) -- each once for the whole batch.
+
+    `confidences` is the confidence_score per row when the caller already
+    guessed some categories (default: every category is the user's own).
     """
 
     print(f"DEBUG: Starting parse_csv_rows for user_id={user_id} with {len(rows)} rows.")
     seen = set()
     inserted_count = 0
+    inserted = []
+
+    confidences = list(confidences) if confidences is not None else [USER_CHOSEN_CONFIDENCE] * len(rows)
+    pending = [i for i, row in enumerate(rows) if needs_category(row.category)]
+    if pending:
+        rows = list(rows)
+        suggestions = suggest_categories((rows[i].description for i in pending), db, user_id)
+        for i, (category, confidence) in zip(pending, suggestions):
+            rows[i] = rows[i].copy(update={"category": category})
+            confidences[i] = confidence
+        logger.debug("Categorized %d rows for user %s", len(pending), user_id)
+
+    resolved_rates = resolve_gst_rates(rows)
 
-    for row in rows:
+    for row, (tax_rate, tax_rate_source), confidence in zip(rows, resolved_rates, confidences):
         fingerprint = (
             row.date,
             row.description.strip().lower(),
@@ -34,16 +66,7 @@ def parse_csv_rows(
         seen.add(fingerprint)
 
         # Calculate tax locally since row is Pydantic model
-        tax_rate = row.tax_rate
-        if tax_rate is None:
-             if row.tax_type == "GST":
-                 tax_rate = 18.0
-             else:
-                 tax_rate = 0.0
-        
-        taxable = row.taxable_amount or 0.0
-        tax_amount = round((taxable * tax_rate) / 100, 2)
-        total_amount = round(taxable + tax_amount, 2)
+        tax_amount, total_amount = compute_tax_amounts(row.taxable_amount, tax_rate)
 
         try:
             db_record = TaxRecord(
@@ -56,12 +79,15 @@ def parse_csv_rows(
                 taxable_amount=row.taxable_amount,
                 tax_type=row.tax_type,
                 tax_rate=tax_rate,
+                hsn_code=row.hsn_code,
+                tax_rate_source=tax_rate_source,
                 tax_amount=tax_amount,
                 total_amount=total_amount,
-                confidence_score=1.0,
+                confidence_score=confidence,
             )
             # Use add() instead of bulk_save for safer commit and error visibility
             db.add(db_record)
+            inserted.append(db_record)
             inserted_count += 1
         except Exception as e:
             print(f"DEBUG: Error creating record object: {e}")
@@ -69,8 +95,13 @@ def parse_csv_rows(
     if inserted_count > 0:
         try:
             print(f"DEBUG: Committing {inserted_count} records to DB...")
+            apply_records_to_rollups(db, user_id, inserted)
+            contributions = record_contributions(inserted)
+            samples = category_samples(inserted)
+            token = begin_write(user_id)
             db.commit()
             print("DEBUG: Commit successful.")
+            publish_write(user_id, token, contributions, samples)
         except Exception as e:
             print(f"DEBUG: Commit failed: {e}")
             db.rollback()
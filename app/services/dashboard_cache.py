@@ -1,17 +1,226 @@
-from typing import Dict
-from app.services.dashboard_service import build_dashboard
+from datetime import date, timedelta
+from typing import Optional
 
-_dashboard_cache: Dict[int, dict] = {}
+from app.config import DASHBOARD_CACHE_TTL
+from app.services.cache import NamespacedCache, bump_data_version, get_data_version
+from app.services.dashboard_service import (
+    assemble_dashboard,
+    dashboard_partials,
+    empty_partial,
+    partials_from_totals,
+)
+from app.services.rollup_service import rollup_month_bounds, split_full_months, summarize_range
+from app.services.aggregate_deltas import apply_to_partials
+from app.schemas.dashboard import DashboardResponse
+from app.utils.encoded_response import encode_json_gzip
+
+# Keyed by (user_id, start, end, data_version) and holding the range's
+# {"YYYY-MM": partial} map. Writes either carry entries forward to the new
+# version with the write applied, or (on conflict) leave them to age out.
+_dashboard_cache = NamespacedCache("dashboard", ttl_seconds=DASHBOARD_CACHE_TTL)
+
+# Whole-month partial aggregates, keyed by (user_id, "YYYY-MM", data_version).
+# Any date range is assembled from these plus the partial months at its edges.
+_month_cache = NamespacedCache("dashboard_month", ttl_seconds=DASHBOARD_CACHE_TTL)
+
+# Ready-to-send gzipped JSON of the assembled dashboard, keyed like
+# _dashboard_cache. Not carried across writes: re-encoding from the
+# carried-forward partials is cheap.
+_dashboard_json_cache = NamespacedCache("dashboard_json", ttl_seconds=DASHBOARD_CACHE_TTL)
+
+# Per (user_id, data_version): which ranges and months are cached, so a
+# write knows what to carry forward.
+_index_cache = NamespacedCache("dashboard_index", ttl_seconds=DASHBOARD_CACHE_TTL)
+
+GROUP_BY = ("month", "transaction_type", "category")
+
+
+def _dashboard_key(user_id: int, start_date, end_date, version: int):
+    return (user_id, start_date or "", end_date or "", version)
+
+
+def _add_to_index(user_id: int, version: int, ranges=(), months=()) -> None:
+    index = _index_cache.get((user_id, version)) or {"ranges": [], "months": []}
+    for r in ranges:
+        if r not in index["ranges"]:
+            index["ranges"].append(r)
+    index["months"] = sorted(set(index["months"]) | set(months))
+    _index_cache.set((user_id, version), index)
+
+
+def _month_range(first: date, last: date):
+    months = []
+    m = first
+    while m <= last:
+        months.append(m)
+        m = (m.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return months
+
+
+def _load_month_partials(db, user_id: int, first: date, last: date, version: int) -> dict:
+    """Cached whole-month partials for [first, last]; misses are fetched in one rollup query."""
+    partials = {}
+    missing = []
+
+    for m in _month_range(first, last):
+        label = m.strftime("%Y-%m")
+        cached = _month_cache.get((user_id, label, version))
+        if cached is None:
+            missing.append(m)
+        else:
+            partials[label] = cached
+
+    if missing:
+        last_missing = (missing[-1].replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        fetched = partials_from_totals(
+            summarize_range(db, user_id, missing[0], last_missing, group_by=GROUP_BY)
+        )
+        # Only cache what was read without a write landing in between
+        fresh = get_data_version(user_id) == version
+        for m in missing:
+            label = m.strftime("%Y-%m")
+            partial = fetched.get(label, empty_partial())
+            if fresh:
+                _month_cache.set((user_id, label, version), partial)
+            partials[label] = partial
+
+        if fresh:
+            _add_to_index(user_id, version, months=[m.strftime("%Y-%m") for m in missing])
+
+    return partials
+
+
+def _build_partials(db, user_id: int, start_date: Optional[date], end_date: Optional[date], version: int) -> dict:
+    # Open ends are clamped to the months the user actually has data for
+    if start_date is None or end_date is None:
+        first, last = rollup_month_bounds(db, user_id)
+        if first is None:
+            return {}
+        start_date = start_date or first
+        end_date = end_date or (last.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+    if start_date > end_date:
+        return {}
+
+    first_month, last_month, edges = split_full_months(start_date, end_date)
+
+    partials = {}
+    if first_month is not None:
+        partials.update(_load_month_partials(db, user_id, first_month, last_month, version))
+
+    # Only the partial months at each edge hit the database
+    for edge_start, edge_end in edges:
+        partials.update(dashboard_partials(db, user_id, edge_start, edge_end))
+
+    return partials
+
+
+def build_and_cache_dashboard(
+    db,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> dict:
+    # Read the version before AND after building: if a write landed
+    # mid-build the result may or may not include it, so it is not cached
+    # (deltas must only ever be applied to aggregates that exclude the write).
+    version = get_data_version(user_id)
+    partials = _build_partials(db, user_id, start_date, end_date, version)
+
+    if get_data_version(user_id) == version:
+        _dashboard_cache.set(
+            _dashboard_key(user_id, start_date, end_date, version),
+            {"partials": partials},
+        )
+        _add_to_index(
+            user_id,
+            version,
+            ranges=[[str(start_date or ""), str(end_date or "")]],
+        )
+
+    return assemble_dashboard(partials)
 
 
 def warm_dashboard_cache(db, user_id: int):
-    _dashboard_cache[user_id] = build_dashboard(db, user_id)
+    build_and_cache_dashboard(db, user_id)
+
+
+def get_cached_dashboard(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    cached = _dashboard_cache.get(
+        _dashboard_key(user_id, start_date, end_date, get_data_version(user_id))
+    )
+    if cached is None:
+        return None
+    return assemble_dashboard(cached["partials"])
+
+
+def get_dashboard_json(
+    db,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> bytes:
+    """
+    The dashboard as gzipped JSON bytes. A hit is a single cache read with
+    no Pydantic validation or JSON encoding.
+    """
+    version = get_data_version(user_id)
+    key = _dashboard_key(user_id, start_date, end_date, version)
+
+    body = _dashboard_json_cache.get_bytes(key)
+    if body is not None:
+        return body
+
+    dashboard = get_cached_dashboard(user_id, start_date, end_date)
+    if dashboard is None:
+        dashboard = build_and_cache_dashboard(db, user_id, start_date, end_date)
+
+    # Validate once on the way in, never again on a hit
+    body = encode_json_gzip(DashboardResponse(**dashboard).dict())
+    if get_data_version(user_id) == version:
+        _dashboard_json_cache.set_bytes(key, body)
+    return body
+
+
+def carry_forward_dashboards(user_id: int, old_version: int, new_version: int, contributions) -> None:
+    """
+    Re-keys every cached range and month partial from old_version to
+    new_version with the write's contributions applied. Entries that fail
+    the consistency check are dropped and rebuilt on the next read.
+    """
+    index = _index_cache.get((user_id, old_version))
+    if not index:
+        return
+
+    carried = {"ranges": [], "months": []}
+
+    for start, end in index["ranges"]:
+        entry = _dashboard_cache.get(_dashboard_key(user_id, start, end, old_version))
+        if entry is None:
+            continue
+        _dashboard_cache.delete(_dashboard_key(user_id, start, end, old_version))
+        if apply_to_partials(entry["partials"], contributions, start or None, end or None):
+            _dashboard_cache.set(_dashboard_key(user_id, start, end, new_version), entry)
+            carried["ranges"].append([start, end])
 
+    for label in index["months"]:
+        partial = _month_cache.get((user_id, label, old_version))
+        if partial is None:
+            continue
+        _month_cache.delete((user_id, label, old_version))
+        month_partials = {label: partial}
+        touching = [c for c in contributions if c[0][:7] == label]
+        if apply_to_partials(month_partials, touching):
+            _month_cache.set((user_id, label, new_version), month_partials[label])
+            carried["months"].append(label)
 
-def get_cached_dashboard(user_id: int):
-    return _dashboard_cache.get(user_id)
+    _index_cache.delete((user_id, old_version))
+    _index_cache.set((user_id, new_version), carried)
 
 
 def invalidate_dashboard_cache(user_id: int):
-    if user_id in _dashboard_cache:
-        del _dashboard_cache[user_id]
\ No newline at end of file
+    bump_data_version(user_id)
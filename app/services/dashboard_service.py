@@ -1,64 +1,106 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from collections import defaultdict
 from app.models.tax_record import TaxRecord
+from app.utils.money import add_rupees, sum_rupees
+from app.utils.sql import month_label
 
 
 from typing import Optional
 from datetime import date
 
-def build_dashboard(db: Session, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
-    query = db.query(TaxRecord).filter(TaxRecord.user_id == user_id)
+def dashboard_partials(db: Session, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
+    """
+    {"YYYY-MM": partial} for the range, computed with ONE
+    GROUP BY month, transaction_type, category query.
+    """
+    bucket = month_label(db.get_bind().dialect.name, TaxRecord.date)
+
+    query = db.query(
+        bucket,
+        TaxRecord.transaction_type,
+        TaxRecord.category,
+        func.sum(TaxRecord.taxable_amount),
+        func.sum(func.coalesce(TaxRecord.tax_amount, 0.0)),
+    ).filter(TaxRecord.user_id == user_id)
 
     if start_date:
         query = query.filter(TaxRecord.date >= start_date)
     if end_date:
         query = query.filter(TaxRecord.date <= end_date)
 
-    records = query.all()
+    partials = defaultdict(empty_partial)
+
+    for month, transaction_type, category, taxable, tax in query.group_by(
+        bucket, TaxRecord.transaction_type, TaxRecord.category
+    ):
+        p = partials[month]
+        if transaction_type in ("income", "expense"):
+            p[transaction_type][category] = add_rupees(p[transaction_type].get(category), taxable)
+        p["tax"] = add_rupees(p["tax"], tax)
+
+    return dict(partials)
+
+
+def build_dashboard(db: Session, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
+    # Aggregation happens in SQL; Python only shapes O(months x categories) rows
+    return assemble_dashboard(dashboard_partials(db, user_id, start_date, end_date))
+
 
-    total_income = 0.0
-    total_expense = 0.0
-    estimated_tax = 0.0
+def empty_partial() -> dict:
+    return {"income": {}, "expense": {}, "tax": 0.0}
 
+
+def partials_from_totals(totals: dict) -> dict:
+    """
+    Turns summarize_range(..., group_by=("month", "transaction_type", "category"))
+    output into {"YYYY-MM": partial}, where a partial holds the per-category
+    income/expense sums and the tax of one (possibly partial) month.
+    """
+    partials = defaultdict(empty_partial)
+
+    for (month, transaction_type, category), (taxable, tax, _, _) in totals.items():
+        p = partials[month.strftime("%Y-%m")]
+        if transaction_type in ("income", "expense"):
+            p[transaction_type][category] = add_rupees(p[transaction_type].get(category), taxable)
+        p["tax"] = add_rupees(p["tax"], tax)
+
+    return dict(partials)
+
+
+def assemble_dashboard(partials: dict) -> dict:
+    """Builds the DashboardResponse dict from {"YYYY-MM": partial}. Sums are exact (paise)."""
     income_by_category = defaultdict(float)
     expense_by_category = defaultdict(float)
+    monthly_trend = []
+
+    for month, p in sorted(partials.items()):
+        income = sum_rupees(p["income"].values())
+        expense = sum_rupees(p["expense"].values())
+        if not p["income"] and not p["expense"] and not p["tax"]:
+            continue
+
+        for category, amount in p["income"].items():
+            income_by_category[category] = add_rupees(income_by_category[category], amount)
+        for category, amount in p["expense"].items():
+            expense_by_category[category] = add_rupees(expense_by_category[category], amount)
 
-    monthly = defaultdict(lambda: {"income": 0.0, "expense": 0.0, "tax": 0.0})
-
-    for r in records:
-        if r.transaction_type == "income":
-            total_income += r.taxable_amount
-            income_by_category[r.category] += r.taxable_amount
-            monthly[r.date.strftime("%Y-%m")]["income"] += r.taxable_amount
-
-        elif r.transaction_type == "expense":
-            total_expense += r.taxable_amount
-            expense_by_category[r.category] += r.taxable_amount
-            monthly[r.date.strftime("%Y-%m")]["expense"] += r.taxable_amount
-
-        if r.tax_amount:
-            estimated_tax += r.tax_amount
-            monthly[r.date.strftime("%Y-%m")]["tax"] += r.tax_amount
-
-    monthly_trend = [
-        {
-            "month": m,
-            "income": round(v["income"], 2),
-            "expense": round(v["expense"], 2),
-            "tax": round(v["tax"], 2),
-        }
-        for m, v in sorted(monthly.items())
-    ]
+        monthly_trend.append({
+            "month": month,
+            "income": round(income, 2),
+            "expense": round(expense, 2),
+            "tax": round(p["tax"], 2),
+        })
 
     return {
         "summary": {
-            "total_income": round(total_income, 2),
-            "total_expense": round(total_expense, 2),
-            "estimated_tax": round(estimated_tax, 2),
+            "total_income": sum_rupees(income_by_category.values()),
+            "total_expense": sum_rupees(expense_by_category.values()),
+            "estimated_tax": sum_rupees(p["tax"] for p in partials.values()),
         },
         "categories": {
             "income": dict(income_by_category),
             "expense": dict(expense_by_category),
         },
         "monthly_trend": monthly_trend,
-    }
\ No newline at end of file
+    }
@@ -1,105 +1,163 @@
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, distinct, func
 from app.models.tax_record import TaxRecord
 from app.schemas.erl import ERLInsights, CategoryExpense
+from app.config import ERL_CACHE_TTL
+from app.services.cache import NamespacedCache, get_data_version
+from app.utils.encoded_response import encode_json_gzip
+from app.utils.sql import month_start
 from typing import List
-import time
 
-# Simple in-memory cache: {user_id: (timestamp, data)}
-_erl_cache = {}
-CACHE_TTL = 300  # 5 minutes
+# Keyed by (user_id, data_version), holding the aggregated ERL inputs
+_erl_cache = NamespacedCache("erl", ttl_seconds=ERL_CACHE_TTL)
 
 def calculate_economic_metrics(db: Session, user_id: int) -> ERLInsights:
     # Check cache
-    if user_id in _erl_cache:
-        timestamp, data = _erl_cache[user_id]
-        if time.time() - timestamp < CACHE_TTL:
-            return data
-
-    # 1. Fetch all records for the user
-    records = db.query(TaxRecord).filter(TaxRecord.user_id == user_id).all()
-    
-    total_income = 0.0
-    total_expenses = 0.0
-    total_tax = 0.0
-    category_map = {}
-
-    for r in records:
-        if r.transaction_type == "income":
-            total_income += r.taxable_amount
-        elif r.transaction_type == "expense":
-            total_expenses += r.taxable_amount
-            
-            # Category tracking
-            cat = r.category or "Uncategorized"
-            category_map[cat] = category_map.get(cat, 0.0) + r.taxable_amount
-            
-        # Tax is tracked separately usually, but let's assume tax_amount is populated
-        total_tax += r.tax_amount
+    version = get_data_version(user_id)
+    cached = _erl_cache.get((user_id, version))
+    if cached is not None:
+        return insights_from_inputs(cached)
+
+    inputs = load_erl_inputs(db, user_id)
+
+    # Skip caching if a write landed while we were reading
+    if get_data_version(user_id) == version:
+        _erl_cache.set((user_id, version), inputs)
+
+    return insights_from_inputs(inputs)
+
+
+# Ready-to-send gzipped JSON of the insights, keyed by (user_id, data_version)
+_erl_json_cache = NamespacedCache("erl_json", ttl_seconds=ERL_CACHE_TTL)
+
+
+def get_erl_insights_json(db: Session, user_id: int) -> bytes:
+    """ERL insights as gzipped JSON bytes; a hit skips Pydantic entirely."""
+    version = get_data_version(user_id)
+    body = _erl_json_cache.get_bytes((user_id, version))
+    if body is not None:
+        return body
+
+    body = encode_json_gzip(calculate_economic_metrics(db, user_id).dict())
+    if get_data_version(user_id) == version:
+        _erl_json_cache.set_bytes((user_id, version), body)
+    return body
+
+
+TOP_CATEGORY_LIMIT = 5
+
+
+def load_erl_inputs(db: Session, user_id: int) -> dict:
+    """
+    Everything the ERL rules need, aggregated in SQL: income / expense / tax
+    totals and the distinct-month count in one pass, then the top expense
+    categories. No records are loaded.
+    """
+    dialect = db.get_bind().dialect.name
+    taxable = func.coalesce(TaxRecord.taxable_amount, 0.0)
+
+    total_income, total_expenses, total_tax, num_months = db.query(
+        func.coalesce(func.sum(case((TaxRecord.transaction_type == "income", taxable), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((TaxRecord.transaction_type == "expense", taxable), else_=0.0)), 0.0),
+        func.coalesce(func.sum(func.coalesce(TaxRecord.tax_amount, 0.0)), 0.0),
+        func.count(distinct(month_start(dialect, TaxRecord.date))),
+    ).filter(TaxRecord.user_id == user_id).one()
+
+    category = func.coalesce(func.nullif(TaxRecord.category, ""), "Uncategorized")
+    amount = func.sum(taxable)
+    top_categories = (
+        db.query(category, amount)
+        .filter(TaxRecord.user_id == user_id, TaxRecord.transaction_type == "expense")
+        .group_by(category)
+        .order_by(amount.desc(), category)
+        .limit(TOP_CATEGORY_LIMIT)
+        .all()
+    )
+
+    return {
+        "total_income": float(total_income),
+        "total_expenses": float(total_expenses),
+        "total_tax": float(total_tax),
+        "top_categories": [[cat, float(total)] for cat, total in top_categories],
+        "num_months": int(num_months),
+    }
+
+
+# ---------- Metric definitions ----------
+# Plain NumPy expressions, so the same definitions serve the snapshot
+# below (scalars) and the time-series / scenario engines (whole arrays).
+
+def savings_rate(income, expenses, tax):
+    """Net savings as % of income; 0 when there is no income."""
+    income = np.asarray(income, dtype=float)
+    has_income = income > 0
+    net_savings = income - expenses - tax
+    return np.where(has_income, net_savings / np.where(has_income, income, 1.0) * 100, 0.0)
+
+
+def tax_efficiency(income, tax):
+    """Tax as % of income; 0 when there is no income."""
+    income = np.asarray(income, dtype=float)
+    has_income = income > 0
+    return np.where(has_income, np.asarray(tax, dtype=float) / np.where(has_income, income, 1.0) * 100, 0.0)
+
+
+def burn_rate(expenses, num_months):
+    """Average expenses per month that has data."""
+    return np.asarray(expenses, dtype=float) / np.maximum(num_months, 1)
+
+
+def health_score(savings_rate, tax_efficiency, burn_rate, avg_income):
+    """
+    Rule-based 0-100 score:
+    - Savings rate > 20% -> +40 (> 10% -> +20)
+    - Tax efficiency < 30% -> +20
+    - Burn rate < Income/month -> +40 (slightly over -> +10)
+    """
+    score = np.where(savings_rate > 20, 40, np.where(savings_rate > 10, 20, 0))
+    # Assuming lower tax is better for user efficiency (legal minimization)
+    score = score + np.where(tax_efficiency < 30, 20, 0)
+    score = score + np.where(
+        burn_rate < avg_income, 40, np.where(burn_rate < avg_income * 1.1, 10, 0)
+    )
+    return np.clip(score, 0, 100)
+
+
+def insights_from_inputs(inputs: dict) -> ERLInsights:
+    total_income = inputs["total_income"]
+    total_expenses = inputs["total_expenses"]
+    total_tax = inputs["total_tax"]
 
     # 2. Derived metrics
     net_savings = total_income - total_expenses - total_tax
-    
-    savings_rate = 0.0
-    if total_income > 0:
-        savings_rate = (net_savings / total_income) * 100
-
-    tax_efficiency = 0.0
-    if total_income > 0:
-        tax_efficiency = (total_tax / total_income) * 100
-        
-    # 3. Top Expenses
-    sorted_cats = sorted(category_map.items(), key=lambda x: x[1], reverse=True)
+    savings = float(savings_rate(total_income, total_expenses, total_tax))
+    efficiency = float(tax_efficiency(total_income, total_tax))
+
+    # 3. Top Expenses (already ranked by the query)
     top_categories = []
-    for cat, amount in sorted_cats[:5]: # Top 5
+    for cat, amount in inputs["top_categories"]:
         percentage = 0.0
         if total_expenses > 0:
             percentage = (amount / total_expenses) * 100
         top_categories.append(CategoryExpense(category=cat, amount=amount, percentage=percentage))
 
-    # 4. Burn Rate (Monthly Average)
-    # Simple approximation: total expenses / distinct months
-    # For now, let's just use total / 12 if we have data spanning a year, or just average per record month?
-    # Better: Count distinct YYYY-MM
-    months = set()
-    for r in records:
-        months.add(r.date.strftime("%Y-%m"))
-    
-    num_months = len(months) if months else 1
-    monthly_burn_rate = total_expenses / num_months
+    # 4. Burn Rate (Monthly Average): total expenses / distinct YYYY-MM
+    num_months = inputs["num_months"] or 1
+    monthly_burn_rate = float(burn_rate(total_expenses, num_months))
 
     # 5. Financial Health Score (Rule-based)
-    # Rules: 
-    # - Savings rate > 20% -> +40
-    # - Tax efficiency < 30% -> +20
-    # - Burn rate < Income/month -> +40
-    score = 0
-    if savings_rate > 20:
-        score += 40
-    elif savings_rate > 10:
-        score += 20
-        
-    if tax_efficiency < 30: # Assuming lower tax is better for user efficiency (legal minimization)
-        score += 20
-        
     avg_income = total_income / num_months
-    if monthly_burn_rate < avg_income:
-        score += 40
-    elif monthly_burn_rate < avg_income * 1.1: # Slightly over
-        score += 10
+    score = int(health_score(savings, efficiency, monthly_burn_rate, avg_income))
 
-    insights = ERLInsights(
+    return ERLInsights(
         total_income=total_income,
         total_expenses=total_expenses,
         net_savings=net_savings,
-        savings_rate=round(savings_rate, 2),
-        tax_efficiency=round(tax_efficiency, 2),
+        savings_rate=round(savings, 2),
+        tax_efficiency=round(efficiency, 2),
         projected_tax=total_tax, # Simple projection based on actuals
         top_expense_categories=top_categories,
         monthly_burn_rate=round(monthly_burn_rate, 2),
-        financial_health_score=min(100, max(0, score))
+        financial_health_score=score
     )
-    
-    # Update cache
-    _erl_cache[user_id] = (time.time(), insights)
-    return insights
@@ -0,0 +1,103 @@
+from datetime import date
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.services.erl_service import burn_rate, savings_rate, tax_efficiency
+from app.services.rollup_service import summarize_range
+from app.utils.money import PAISE_PER_RUPEE, paise_array
+
+DEFAULT_WINDOWS = (3, 12)
+
+
+def monthly_vectors(db: Session, user_id: int) -> dict:
+    """
+    The user's history as dense per-month NumPy arrays (income, expenses,
+    tax, record count), one slot per calendar month from the first month
+    with data to the last. Months without records are zeros.
+    """
+    totals = summarize_range(db, user_id, group_by=("month", "transaction_type"))
+    if not totals:
+        return {"months": [], "income": np.zeros(0), "expenses": np.zeros(0), "tax": np.zeros(0), "count": np.zeros(0)}
+
+    keys = list(totals)
+    # Money is summed as int64 paise (exact), converted to rupees at the end
+    money = paise_array([totals[k][:2] for k in keys])  # taxable, tax
+    record_counts = np.array([totals[k][3] for k in keys])
+    ordinals = np.array([m.year * 12 + m.month - 1 for m, _ in keys])
+    types = np.array([t for _, t in keys])
+
+    first = ordinals.min()
+    slot = ordinals - first
+    size = ordinals.max() - first + 1
+
+    income = np.zeros(size, dtype=np.int64)
+    expenses = np.zeros(size, dtype=np.int64)
+    tax = np.zeros(size, dtype=np.int64)
+    count = np.zeros(size)
+
+    np.add.at(income, slot[types == "income"], money[types == "income", 0])
+    np.add.at(expenses, slot[types == "expense"], money[types == "expense", 0])
+    np.add.at(tax, slot, money[:, 1])
+    np.add.at(count, slot, record_counts)
+
+    months = [date(o // 12, o % 12 + 1, 1).strftime("%Y-%m") for o in range(first, first + size)]
+    return {
+        "months": months,
+        "income": income / PAISE_PER_RUPEE,
+        "expenses": expenses / PAISE_PER_RUPEE,
+        "tax": tax / PAISE_PER_RUPEE,
+        "count": count,
+    }
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing `window`-month sums via one cumulative sum: sum[i] = c[i+1] - c[i+1-window].
+    Windows at the start of the history cover the months available so far.
+    Integer input (paise) stays integer, so the differences are exact.
+    """
+    c = np.concatenate(([0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    return c[end] - c[np.maximum(end - window, 0)]
+
+
+def erl_timeseries(db: Session, user_id: int, windows: Sequence[int] = DEFAULT_WINDOWS) -> dict:
+    """
+    Per-month trailing-window burn rate, savings rate and tax efficiency,
+    using the same metric definitions as the ERL snapshot over each window.
+    """
+    v = monthly_vectors(db, user_id)
+    has_data = (v["count"] > 0).astype(float)
+
+    rolling = {}
+    for window in windows:
+        income = rolling_sum(paise_array(v["income"]), window) / PAISE_PER_RUPEE
+        expenses = rolling_sum(paise_array(v["expenses"]), window) / PAISE_PER_RUPEE
+        tax = rolling_sum(paise_array(v["tax"]), window) / PAISE_PER_RUPEE
+        # Burn rate divides by months that have records, as in the snapshot
+        months_with_data = rolling_sum(has_data, window)
+
+        rolling[window] = {
+            "monthly_burn_rate": np.round(burn_rate(expenses, months_with_data), 2).tolist(),
+            "savings_rate": np.round(savings_rate(income, expenses, tax), 2).tolist(),
+            "tax_efficiency": np.round(tax_efficiency(income, tax), 2).tolist(),
+        }
+
+    income, expenses, tax = v["income"].tolist(), v["expenses"].tolist(), v["tax"].tolist()
+
+    points = []
+    for i, month in enumerate(v["months"]):
+        points.append({
+            "month": month,
+            "total_income": income[i],
+            "total_expenses": expenses[i],
+            "total_tax": tax[i],
+            "rolling": [
+                {"window": window, **{name: values[i] for name, values in metrics.items()}}
+                for window, metrics in rolling.items()
+            ],
+        })
+
+    return {"windows": list(windows), "points": points}
@@ -0,0 +1,109 @@
+import json
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from app.config import GST_RATES_PATH
+
+# Where a record's tax_rate came from (stored in tax_records.tax_rate_source)
+SOURCE_PROVIDED = "provided"        # given on the record itself
+SOURCE_HSN = "hsn"                  # HSN/SAC code lookup
+SOURCE_CATEGORY = "category"        # category name lookup
+SOURCE_GST_DEFAULT = "gst_default"  # tax_type GST, nothing more specific known
+SOURCE_NO_GST = "no_gst"            # not a GST supply
+
+DEFAULT_GST_RATE = 18.0
+
+
+def _normalize_category(category: Optional[str]) -> str:
+    return " ".join((category or "").lower().split())
+
+
+def _normalize_hsn(code: Optional[str]) -> str:
+    return "".join(ch for ch in (code or "") if ch.isdigit())
+
+
+class GSTRateIndex:
+    """
+    Precomputed lookups: HSN/SAC prefix -> rate and normalized category ->
+    rate. HSN codes are hierarchical (chapter, heading, sub-heading...), so
+    the prefix dict acts as a flattened trie: a lookup probes only the
+    prefix lengths that exist in the table, longest first.
+    """
+
+    def __init__(self, raw: dict):
+        self.hsn = {_normalize_hsn(code): float(rate) for code, rate in raw.get("hsn", {}).items()}
+        self.categories = {
+            _normalize_category(name): float(rate) for name, rate in raw.get("categories", {}).items()
+        }
+        self.prefix_lengths = sorted({len(code) for code in self.hsn}, reverse=True)
+
+    def rate_for_hsn(self, code: Optional[str]) -> Optional[float]:
+        digits = _normalize_hsn(code)
+        if not digits:
+            return None
+        for length in self.prefix_lengths:
+            if length <= len(digits):
+                rate = self.hsn.get(digits[:length])
+                if rate is not None:
+                    return rate
+        return None
+
+    def rate_for_category(self, category: Optional[str]) -> Optional[float]:
+        return self.categories.get(_normalize_category(category))
+
+    def resolve(
+        self,
+        tax_rate: Optional[float],
+        tax_type: Optional[str],
+        hsn_code: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Tuple[float, str]:
+        """(rate, source) for one record; see resolve_gst_rates."""
+        if tax_rate is not None:
+            return tax_rate, SOURCE_PROVIDED
+
+        is_gst = tax_type == "GST"
+        if not (is_gst or hsn_code):
+            return 0.0, SOURCE_NO_GST
+
+        rate = self.rate_for_hsn(hsn_code)
+        if rate is not None:
+            return rate, SOURCE_HSN
+
+        if is_gst:
+            rate = self.rate_for_category(category)
+            if rate is not None:
+                return rate, SOURCE_CATEGORY
+            return DEFAULT_GST_RATE, SOURCE_GST_DEFAULT
+
+        return 0.0, SOURCE_NO_GST
+
+
+@lru_cache(maxsize=1)
+def get_gst_rate_index() -> GSTRateIndex:
+    """Parsed once per process (warmed at startup)."""
+    with open(GST_RATES_PATH) as f:
+        return GSTRateIndex(json.load(f))
+
+
+def resolve_gst_rate(record) -> Tuple[float, str]:
+    """(rate, source) for anything with tax_rate / tax_type / hsn_code / category attributes."""
+    return get_gst_rate_index().resolve(
+        record.tax_rate,
+        record.tax_type,
+        getattr(record, "hsn_code", None),
+        record.category,
+    )
+
+
+def resolve_gst_rates(records: Iterable) -> List[Tuple[float, str]]:
+    """
+    Batch form for imports: one pass over the rows with the index bound
+    once. Precedence per row: the record's own tax_rate, then its HSN/SAC
+    code, then (for GST records) its category, then 18% for GST / 0 otherwise.
+    """
+    resolve = get_gst_rate_index().resolve
+    return [
+        resolve(r.tax_rate, r.tax_type, getattr(r, "hsn_code", None), r.category)
+        for r in records
+    ]
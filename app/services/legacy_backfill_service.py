@@ -0,0 +1,116 @@
+import logging
+from typing import List
+
+from sqlalchemy import BigInteger, Numeric, and_, case, cast, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.tax_record import TaxRecord
+from app.services.gst_rate_resolver import (
+    DEFAULT_GST_RATE,
+    SOURCE_CATEGORY,
+    SOURCE_GST_DEFAULT,
+    SOURCE_NO_GST,
+    SOURCE_PROVIDED,
+    get_gst_rate_index,
+)
+from app.services.rollup_service import rebuild_rollups
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHUNK_SIZE = 5000
+
+# Rows created before tax logic existed
+LEGACY_FILTER = or_(TaxRecord.tax_amount.is_(None), TaxRecord.total_amount.is_(None))
+
+
+def _round_paise(expr):
+    # Through NUMERIC so half-paisa rounds up, like rupees_to_paise
+    return cast(func.round(cast(expr, Numeric)), BigInteger)
+
+
+def _backfill_values() -> dict:
+    """
+    Same rules as compute_tax_for_record, as SQL expressions over the raw
+    paise columns. Every SET expression sees the row's OLD values, so the
+    resolved rate is inlined rather than read back from tax_rate.
+
+    Legacy rows predate hsn_code, so only the category table applies.
+    """
+    index = get_gst_rate_index()
+    taxable = func.coalesce(TaxRecord.taxable_amount, literal(0))
+    category = func.lower(func.trim(TaxRecord.category))
+    is_gst = TaxRecord.tax_type == "GST"
+
+    category_rate = case(
+        *[(category == name, literal(rate)) for name, rate in index.categories.items()],
+        else_=literal(DEFAULT_GST_RATE),
+    )
+    rate = func.coalesce(
+        TaxRecord.tax_rate,
+        case((is_gst, category_rate), else_=literal(0.0)),
+    )
+    source = case(
+        (TaxRecord.tax_rate.isnot(None), literal(SOURCE_PROVIDED)),
+        (and_(is_gst, category.in_(list(index.categories))), literal(SOURCE_CATEGORY)),
+        (is_gst, literal(SOURCE_GST_DEFAULT)),
+        else_=literal(SOURCE_NO_GST),
+    )
+    # Exact NUMERIC product, rounded once
+    tax = _round_paise(cast(taxable, Numeric) * cast(rate, Numeric) / 100)
+
+    return {
+        "tax_rate": rate,
+        "tax_rate_source": source,
+        "tax_amount": tax,
+        "total_amount": taxable + tax,
+    }
+
+
+def legacy_user_ids(db: Session) -> List[int]:
+    return list(db.scalars(select(TaxRecord.user_id).where(LEGACY_FILTER).distinct()))
+
+
+def backfill_legacy_tax(db: Session, chunk_size: int = BACKFILL_CHUNK_SIZE) -> int:
+    """
+    Computes tax_rate / tax_amount / total_amount for every legacy row with
+    one set-based UPDATE per id range, committing after each chunk so locks
+    stay short and an interrupted run can simply be restarted.
+
+    Afterwards the affected users' monthly_rollups are rebuilt (they counted
+    the NULL taxes as 0) and their cached aggregates invalidated.
+
+    Returns the number of rows updated.
+    """
+    user_ids = legacy_user_ids(db)
+    if not user_ids:
+        return 0
+
+    low, high = db.execute(
+        select(func.min(TaxRecord.id), func.max(TaxRecord.id)).where(LEGACY_FILTER)
+    ).one()
+
+    values = _backfill_values()
+    updated = 0
+
+    for chunk_start in range(low, high + 1, chunk_size):
+        stmt = (
+            update(TaxRecord)
+            .where(
+                and_(
+                    TaxRecord.id >= chunk_start,
+                    TaxRecord.id < chunk_start + chunk_size,
+                    LEGACY_FILTER,
+                )
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        updated += db.execute(stmt).rowcount
+        db.commit()
+        logger.info("Backfilled ids %d..%d, %d rows so far", chunk_start, chunk_start + chunk_size - 1, updated)
+
+    # rebuild_rollups bumps each user's data version
+    for user_id in user_ids:
+        rebuild_rollups(db, user_id)
+
+    return updated
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import Date, String, and_, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.tax_record import TaxRecord
+from app.services.tax_calculator import compute_summary_from_totals
+from app.services.tax_regimes import rule_table_for
+from app.utils.money import add_rupees
+
+METRICS = ("total_income", "total_expense", "estimated_tax")
+
+
+def _period_buckets(ranges: List[Tuple[str, date, date]]):
+    """Inline (period, start_date, end_date) table, one row per requested period."""
+    rows = [
+        select(
+            literal(label, String).label("period"),
+            literal(start, Date).label("start_date"),
+            literal(end, Date).label("end_date"),
+        )
+        for label, start, end in ranges
+    ]
+    if len(rows) == 1:
+        return rows[0].subquery("buckets")
+    return union_all(*rows).subquery("buckets")
+
+
+def compare_periods(
+    db: Session,
+    user_id: int,
+    ranges: List[Tuple[str, date, date]],
+) -> dict:
+    """
+    Summarizes several (possibly overlapping) periods with ONE grouped
+    query: tax_records is joined to an inline table of period bounds and
+    grouped by period bucket, so each record is scanned once and counted
+    in every period it falls into.
+
+    Deltas are reported for every period against the first one.
+    """
+    buckets = _period_buckets(ranges)
+    stmt = (
+        select(
+            buckets.c.period,
+            TaxRecord.transaction_type,
+            func.sum(TaxRecord.taxable_amount),
+            func.sum(func.coalesce(TaxRecord.tax_amount, 0.0)),
+        )
+        .select_from(TaxRecord)
+        .join(
+            buckets,
+            and_(
+                TaxRecord.date >= buckets.c.start_date,
+                TaxRecord.date <= buckets.c.end_date,
+            ),
+        )
+        .where(
+            TaxRecord.user_id == user_id,
+            # lets the planner use the date index for the overall span
+            TaxRecord.date >= min(start for _, start, _ in ranges),
+            TaxRecord.date <= max(end for _, _, end in ranges),
+        )
+        .group_by(buckets.c.period, TaxRecord.transaction_type)
+    )
+
+    sums = defaultdict(lambda: {"income": 0.0, "expense": 0.0, "tax": 0.0})
+    for period, transaction_type, taxable, tax in db.execute(stmt):
+        s = sums[period]
+        if transaction_type in ("income", "expense"):
+            s[transaction_type] = add_rupees(s[transaction_type], taxable)
+        s["tax"] = add_rupees(s["tax"], tax)
+
+    periods = []
+    for label, start, end in ranges:
+        s = sums[label]
+        periods.append({
+            "period": label,
+            "start_date": start,
+            "end_date": end,
+            **compute_summary_from_totals(s["income"], s["expense"], s["tax"], rule_table_for(end)),
+        })
+
+    baseline = periods[0]
+    deltas = []
+    for p in periods[1:]:
+        delta = {"period": p["period"], "baseline": baseline["period"]}
+        for metric in METRICS:
+            change = add_rupees(p[metric], -baseline[metric])
+            delta[metric] = {
+                "change": change,
+                "change_pct": round(change / baseline[metric] * 100, 2) if baseline[metric] else None,
+            }
+        deltas.append(delta)
+
+    return {"periods": periods, "deltas": deltas}
@@ -0,0 +1,201 @@
+import base64
+from datetime import date
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.tax_record import TaxRecord
+from app.services.tax_calculator import compute_tax_for_record
+
+# TaxRecordResponse fields, in the order Pydantic serializes them
+RECORD_RESPONSE_FIELDS = (
+    "source",
+    "date",
+    "description",
+    "category",
+    "transaction_type",
+    "taxable_amount",
+    "tax_rate",
+    "tax_type",
+    "hsn_code",
+    "id",
+    "tax_amount",
+    "total_amount",
+    "confidence_score",
+    "tax_rate_source",
+)
+
+_COLUMNS = [getattr(TaxRecord, name) for name in RECORD_RESPONSE_FIELDS]
+_DATE = RECORD_RESPONSE_FIELDS.index("date")
+_ID = RECORD_RESPONSE_FIELDS.index("id")
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_BATCH_SIZE = 1000
+
+
+def encode_cursor(row: tuple) -> str:
+    """Opaque keyset cursor pointing just past `row` in (date, id) order."""
+    raw = f"{row[_DATE].isoformat()}:{row[_ID]}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, record_id = base64.urlsafe_b64decode(padded).decode().split(":")
+        return date.fromisoformat(day), int(record_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def record_filter_clauses(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    tax_rate: Optional[float] = None,
+) -> list:
+    """
+    WHERE clauses for the GET /records/ filters, shared by every output
+    format (JSON, NDJSON, Arrow) so one query string selects one row set.
+    Each filter has a matching (user_id, <column>, ...) index on tax_records.
+    """
+    clauses = [TaxRecord.user_id == user_id]
+
+    if start_date:
+        clauses.append(TaxRecord.date >= start_date)
+    if end_date:
+        clauses.append(TaxRecord.date <= end_date)
+    if category:
+        clauses.append(TaxRecord.category == category)
+    if transaction_type:
+        clauses.append(TaxRecord.transaction_type == transaction_type)
+    if min_amount is not None:
+        clauses.append(TaxRecord.taxable_amount >= min_amount)
+    if max_amount is not None:
+        clauses.append(TaxRecord.taxable_amount <= max_amount)
+    if tax_rate is not None:
+        clauses.append(TaxRecord.tax_rate == tax_rate)
+
+    return clauses
+
+
+def filtered_record_select(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    **filters,
+):
+    """The listing SELECT with every filter applied, newest first on (date, id)."""
+    stmt = select(*_COLUMNS).where(*record_filter_clauses(user_id, start_date, end_date, **filters))
+    return stmt.order_by(TaxRecord.date.desc(), TaxRecord.id.desc())
+
+
+def select_record_rows(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    **filters,
+) -> Tuple[List[tuple], Optional[str]]:
+    """
+    Plain column tuples for the listing — no ORM identity map, no entities.
+
+    With a limit, returns one keyset page and the cursor for the next one
+    (None on the last page); without, every matching row and no cursor.
+    """
+    stmt = filtered_record_select(user_id, start_date, end_date, **filters)
+
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(TaxRecord.date, TaxRecord.id) < tuple_(after_date, after_id))
+
+    if limit is None:
+        return [tuple(row) for row in db.execute(stmt)], None
+
+    # One extra row tells us whether there is a next page
+    rows = [tuple(row) for row in db.execute(stmt.limit(limit + 1))]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1])
+
+
+def complete_record(item: dict) -> dict:
+    """
+    Fills in what TaxRecordResponse would for a raw row (as a field ->
+    value dict, in place). Shared by every listing/export format so a
+    record reads the same in each.
+    """
+    # Legacy rows not yet migrated by app.scripts.backfill_legacy_tax:
+    # computed for the response only, never written back
+    if item["tax_amount"] is None or item["total_amount"] is None:
+        legacy = SimpleNamespace(**item)
+        compute_tax_for_record(legacy)
+        item["tax_rate"] = legacy.tax_rate
+        item["tax_amount"] = legacy.tax_amount
+        item["total_amount"] = legacy.total_amount
+        item["tax_rate_source"] = legacy.tax_rate_source
+
+    # Mirrors TaxRecordResponse.default_tax_rate
+    if item["tax_rate"] is None:
+        item["tax_rate"] = 0.0
+    return item
+
+
+def _encode_row(row: tuple) -> dict:
+    return complete_record(dict(zip(RECORD_RESPONSE_FIELDS, row)))
+
+
+def encode_records_json(rows: List[tuple]) -> bytes:
+    """Same JSON as list[TaxRecordResponse], encoded in one orjson call."""
+    return orjson.dumps([_encode_row(r) for r in rows])
+
+
+def ndjson_stream_response(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    **filters,
+) -> StreamingResponse:
+    """
+    Every matching record as newline-delimited JSON, one TaxRecordResponse
+    object per line. Rows come through a server-side cursor and each
+    fetched batch is written out immediately, so memory stays flat however
+    long the history is.
+
+    Opens its own DB session: the request-scoped one may already be
+    closed while the body is still streaming.
+    """
+    stmt = filtered_record_select(user_id, start_date, end_date, **filters).execution_options(
+        stream_results=True,
+        yield_per=NDJSON_BATCH_SIZE,
+    )
+
+    def generate():
+        db = SessionLocal()
+        try:
+            for rows in db.execute(stmt).partitions(NDJSON_BATCH_SIZE):
+                yield b"".join(
+                    orjson.dumps(_encode_row(tuple(row)), option=orjson.OPT_APPEND_NEWLINE)
+                    for row in rows
+                )
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,63 @@
+from datetime import date
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.services.rollup_service import summarize_range
+from app.services.tax_regimes import TaxRuleError, fy_label, get_tax_rule_registry
+from app.utils.money import add_rupees, sum_rupees
+
+
+def fy_range(fy: str):
+    """'2024-25' -> (1 Apr 2024, 31 Mar 2025)."""
+    try:
+        start_year, end_suffix = fy.split("-")
+        start_year = int(start_year)
+        if len(end_suffix) != 2 or int(end_suffix) != (start_year + 1) % 100:
+            raise ValueError
+    except ValueError:
+        raise TaxRuleError("fy must look like 2024-25")
+    return date(start_year, 4, 1), date(start_year + 1, 3, 31)
+
+
+def compare_regimes(db: Session, user_id: int, fy: str = None) -> dict:
+    """
+    The user's income tax for one FY under every regime in the registry.
+    Income is aggregated once; each regime's table then taxes it with a
+    single vectorized evaluation.
+    """
+    fy = fy or fy_label(date.today())
+    start_date, end_date = fy_range(fy)
+
+    totals = summarize_range(db, user_id, start_date, end_date)
+    total_income = totals.get(("income",), [0.0])[0]
+    total_expense = totals.get(("expense",), [0.0])[0]
+    gst_tax = sum_rupees(t[1] for t in totals.values())
+
+    registry = get_tax_rule_registry()
+    default_regime = registry.get(fy).regime
+    income = np.array([total_income])
+
+    regimes = []
+    for table in registry.regimes(fy):
+        liability = {name: float(values[0]) for name, values in table.liability_batch(income).items()}
+        regimes.append({
+            "regime": table.regime,
+            "is_default": table.regime == default_regime,
+            **liability,
+            "total_tax": add_rupees(liability["income_tax"], gst_tax),
+            "effective_rate": round(liability["income_tax"] / total_income * 100, 2) if total_income > 0 else 0.0,
+        })
+
+    recommended = min(regimes, key=lambda r: (r["income_tax"], not r["is_default"]))
+
+    return {
+        "fy": fy,
+        "start_date": start_date,
+        "end_date": end_date,
+        "total_income": round(total_income, 2),
+        "total_expense": round(total_expense, 2),
+        "gst_tax": round(gst_tax, 2),
+        "regimes": regimes,
+        "recommended_regime": recommended["regime"],
+    }
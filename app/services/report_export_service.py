@@ -0,0 +1,168 @@
+import os
+import tempfile
+from collections import defaultdict
+from datetime import date
+from typing import Iterator, Optional
+
+from fastapi.responses import FileResponse
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from app.models.tax_record import TaxRecord
+from app.utils.money import paise_to_rupees, rupees_to_paise
+
+EXPORT_BATCH_SIZE = 2000
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+REPORT_HEADER = [
+    "Date",
+    "Description",
+    "Category",
+    "Type",
+    "Taxable Amount",
+    "Tax Amount",
+    "Total Amount",
+]
+
+
+def stream_report_rows(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Iterator[tuple]:
+    """
+    Yields (date, description, category, transaction_type, taxable, tax, total)
+    tuples ordered by date, fetched in batches through a server-side cursor
+    so no ORM objects are built and memory stays flat.
+    """
+    stmt = select(
+        TaxRecord.date,
+        TaxRecord.description,
+        TaxRecord.category,
+        TaxRecord.transaction_type,
+        TaxRecord.taxable_amount,
+        TaxRecord.tax_amount,
+        TaxRecord.total_amount,
+    ).where(TaxRecord.user_id == user_id)
+
+    if start_date:
+        stmt = stmt.where(TaxRecord.date >= start_date)
+    if end_date:
+        stmt = stmt.where(TaxRecord.date <= end_date)
+
+    stmt = stmt.order_by(TaxRecord.date, TaxRecord.id).execution_options(
+        stream_results=True,
+        yield_per=EXPORT_BATCH_SIZE,
+    )
+
+    for row in db.execute(stmt):
+        yield tuple(row)
+
+
+def write_xlsx_report(rows: Iterator[tuple], path: str) -> None:
+    """
+    Writes a "Records" sheet and a per-category "Summary" sheet using a
+    write-only workbook: rows are flushed to disk as they are appended,
+    only the category totals are held in memory.
+    """
+    wb = Workbook(write_only=True)
+    records_ws = wb.create_sheet("Records")
+    summary_ws = wb.create_sheet("Summary")
+
+    records_ws.append(REPORT_HEADER)
+
+    # Totals are summed as integer paise
+    total_taxable = 0
+    total_tax = 0
+    total_amount = 0
+    by_category = defaultdict(lambda: [0, 0, 0, 0])
+
+    for r_date, description, category, transaction_type, taxable, tax, total in rows:
+        taxable = taxable or 0.0
+        tax = tax or 0.0
+        total = total or 0.0
+
+        records_ws.append([
+            r_date,
+            description,
+            category,
+            transaction_type.capitalize(),
+            round(taxable, 2),
+            round(tax, 2),
+            round(total, 2),
+        ])
+
+        taxable, tax, total = rupees_to_paise(taxable), rupees_to_paise(tax), rupees_to_paise(total)
+        total_taxable += taxable
+        total_tax += tax
+        total_amount += total
+
+        c = by_category[(category, transaction_type)]
+        c[0] += taxable
+        c[1] += tax
+        c[2] += total
+        c[3] += 1
+
+    records_ws.append([])
+    records_ws.append([
+        "TOTAL",
+        None,
+        None,
+        None,
+        paise_to_rupees(total_taxable),
+        paise_to_rupees(total_tax),
+        paise_to_rupees(total_amount),
+    ])
+
+    summary_ws.append([
+        "Category",
+        "Type",
+        "Records",
+        "Taxable Amount",
+        "Tax Amount",
+        "Total Amount",
+    ])
+    for (category, transaction_type), c in sorted(by_category.items()):
+        summary_ws.append([
+            category,
+            transaction_type.capitalize(),
+            c[3],
+            paise_to_rupees(c[0]),
+            paise_to_rupees(c[1]),
+            paise_to_rupees(c[2]),
+        ])
+
+    wb.save(path)
+
+
+def export_xlsx_response(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> FileResponse:
+    """
+    Builds the workbook in a temp file and streams it back; the file is
+    removed once the response has been sent.
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+
+    try:
+        write_xlsx_report(stream_report_rows(db, user_id, start_date, end_date), path)
+    except Exception:
+        os.remove(path)
+        raise
+
+    filename = f"financial_report_{start_date or 'all'}_{end_date or 'all'}.xlsx"
+
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+        background=BackgroundTask(os.remove, path),
+    )
@@ -0,0 +1,308 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import func, select, delete, literal
+from sqlalchemy.orm import Session
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.tax_record import TaxRecord
+from app.services.cache import bump_data_version
+from app.utils.money import add_rupees, paise_to_rupees, rupees_to_paise
+from app.utils.sql import month_start
+
+ROLLUP_KEY = ("month", "category", "transaction_type", "tax_type", "tax_rate")
+ROLLUP_SUMS = ("taxable_amount", "tax_amount", "total_amount")
+
+
+def _record_key(record) -> tuple:
+    return (
+        record.date.replace(day=1),
+        record.category,
+        record.transaction_type,
+        record.tax_type or "NONE",
+        float(record.tax_rate or 0.0),
+    )
+
+
+def apply_records_to_rollups(
+    db: Session,
+    user_id: int,
+    records: Iterable[TaxRecord],
+    sign: int = 1,
+) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) the contribution of `records`
+    to monthly_rollups.
+
+    Does NOT commit: callers run this right before their own commit so
+    the rollup and the raw rows land in the same transaction.
+    """
+    # Money summed as integer paise, converted back once per rollup row
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+
+    for r in records:
+        d = deltas[_record_key(r)]
+        d[0] += sign * rupees_to_paise(r.taxable_amount or 0.0)
+        d[1] += sign * rupees_to_paise(r.tax_amount or 0.0)
+        d[2] += sign * rupees_to_paise(r.total_amount or 0.0)
+        d[3] += sign
+
+    if not deltas:
+        return
+
+    # Sorted so concurrent writers always lock rollup rows in the same order
+    rows = [
+        {
+            "user_id": user_id,
+            "month": key[0],
+            "category": key[1],
+            "transaction_type": key[2],
+            "tax_type": key[3],
+            "tax_rate": key[4],
+            "taxable_amount": paise_to_rupees(d[0]),
+            "tax_amount": paise_to_rupees(d[1]),
+            "total_amount": paise_to_rupees(d[2]),
+            "record_count": d[3],
+        }
+        for key, d in sorted(deltas.items(), key=lambda kv: tuple(map(str, kv[0])))
+    ]
+
+    _upsert_rollup_rows(db, rows)
+
+
+def _upsert_rollup_rows(db: Session, rows: list[dict]) -> None:
+    table = MonthlyRollup.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", *ROLLUP_KEY],
+            set_={
+                "taxable_amount": table.c.taxable_amount + stmt.excluded.taxable_amount,
+                "tax_amount": table.c.tax_amount + stmt.excluded.tax_amount,
+                "total_amount": table.c.total_amount + stmt.excluded.total_amount,
+                "record_count": table.c.record_count + stmt.excluded.record_count,
+            },
+        )
+        db.execute(stmt)
+        return
+
+    # Generic fallback: read-modify-write under a row lock
+    for row in rows:
+        existing = (
+            db.query(MonthlyRollup)
+            .filter_by(user_id=row["user_id"], **{k: row[k] for k in ROLLUP_KEY})
+            .with_for_update()
+            .first()
+        )
+        if existing is None:
+            db.add(MonthlyRollup(**row))
+            continue
+        existing.taxable_amount = add_rupees(existing.taxable_amount, row["taxable_amount"])
+        existing.tax_amount = add_rupees(existing.tax_amount, row["tax_amount"])
+        existing.total_amount = add_rupees(existing.total_amount, row["total_amount"])
+        existing.record_count += row["record_count"]
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recomputes monthly_rollups from tax_records with one set-based
+    INSERT ... SELECT ... GROUP BY. Used for backfills and repairs.
+
+    After the commit the data version of every rebuilt user is bumped, so
+    cached partials and payloads built from the old rollups are dropped.
+
+    Returns the number of rollup rows written.
+    """
+    table = MonthlyRollup.__table__
+    bucket = month_start(db.get_bind().dialect.name, TaxRecord.date)
+
+    tax_type = func.coalesce(TaxRecord.tax_type, literal("NONE"))
+    tax_rate = func.coalesce(TaxRecord.tax_rate, literal(0.0))
+
+    source = (
+        select(
+            TaxRecord.user_id,
+            bucket,
+            TaxRecord.category,
+            TaxRecord.transaction_type,
+            tax_type,
+            tax_rate,
+            func.sum(func.coalesce(TaxRecord.taxable_amount, 0.0)),
+            func.sum(func.coalesce(TaxRecord.tax_amount, 0.0)),
+            func.sum(func.coalesce(TaxRecord.total_amount, 0.0)),
+            func.count(TaxRecord.id),
+        )
+        .group_by(
+            TaxRecord.user_id,
+            bucket,
+            TaxRecord.category,
+            TaxRecord.transaction_type,
+            tax_type,
+            tax_rate,
+        )
+    )
+
+    wipe = delete(table)
+    if user_id is not None:
+        source = source.where(TaxRecord.user_id == user_id)
+        wipe = wipe.where(table.c.user_id == user_id)
+        user_ids = [user_id]
+    else:
+        # Users with records, or with rollups that are about to be wiped
+        user_ids = db.execute(
+            select(TaxRecord.user_id).union(select(table.c.user_id))
+        ).scalars().all()
+
+    db.execute(wipe)
+    result = db.execute(
+        table.insert().from_select(
+            ["user_id", *ROLLUP_KEY, *ROLLUP_SUMS, "record_count"],
+            source,
+        )
+    )
+    db.commit()
+
+    for uid in user_ids:
+        bump_data_version(uid)
+    return result.rowcount
+
+
+def split_full_months(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Splits [start_date, end_date] into the whole months it covers
+    (first_month, last_month — either may be None for open ends)
+    plus the partial-month edge ranges that must be read from tax_records.
+    """
+    if start_date is None:
+        first_month = None
+    elif start_date.day == 1:
+        first_month = start_date
+    else:
+        first_month = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+    if end_date is None:
+        last_month = None
+    else:
+        next_day = end_date + timedelta(days=1)
+        if next_day.day == 1:
+            last_month = end_date.replace(day=1)
+        else:
+            last_month = (end_date.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    if first_month and last_month and first_month > last_month:
+        # Range sits inside one or two partial months — no whole month to reuse
+        return None, None, [(start_date, end_date)]
+
+    edges = []
+    if start_date is not None and first_month != start_date:
+        edges.append((start_date, first_month - timedelta(days=1)))
+    if end_date is not None:
+        last_month_end = (last_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        if last_month_end != end_date:
+            edges.append((last_month_end + timedelta(days=1), end_date))
+
+    return first_month, last_month, edges
+
+
+def summarize_range(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: Sequence[str] = ("transaction_type",),
+) -> dict:
+    """
+    Sums taxable/tax/total amounts and record counts over an inclusive
+    date range, grouped by any of the rollup key columns.
+
+    Whole months come from monthly_rollups; only the partial months at
+    either edge of the range are aggregated from tax_records.
+
+    Returns {group_key_tuple: [taxable, tax, total, count]}, money in
+    rupees (summed exactly, as integer paise).
+    """
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    first_month, last_month, edges = split_full_months(start_date, end_date)
+
+    full_months = not (start_date and end_date and first_month is None)
+    if full_months:
+        cols = [getattr(MonthlyRollup, c) for c in group_by]
+        query = db.query(
+            *cols,
+            func.sum(MonthlyRollup.taxable_amount),
+            func.sum(MonthlyRollup.tax_amount),
+            func.sum(MonthlyRollup.total_amount),
+            func.sum(MonthlyRollup.record_count),
+        ).filter(MonthlyRollup.user_id == user_id)
+
+        if first_month:
+            query = query.filter(MonthlyRollup.month >= first_month)
+        if last_month:
+            query = query.filter(MonthlyRollup.month <= last_month)
+
+        for row in query.group_by(*cols).all():
+            _accumulate(totals, row, len(group_by))
+
+    if edges:
+        cols = []
+        for c in group_by:
+            if c == "month":
+                cols.append(month_start(db.get_bind().dialect.name, TaxRecord.date))
+            elif c == "tax_type":
+                cols.append(func.coalesce(TaxRecord.tax_type, literal("NONE")))
+            elif c == "tax_rate":
+                cols.append(func.coalesce(TaxRecord.tax_rate, literal(0.0)))
+            else:
+                cols.append(getattr(TaxRecord, c))
+
+        for edge_start, edge_end in edges:
+            query = db.query(
+                *cols,
+                func.sum(func.coalesce(TaxRecord.taxable_amount, 0.0)),
+                func.sum(func.coalesce(TaxRecord.tax_amount, 0.0)),
+                func.sum(func.coalesce(TaxRecord.total_amount, 0.0)),
+                func.count(TaxRecord.id),
+            ).filter(TaxRecord.user_id == user_id)
+
+            if edge_start:
+                query = query.filter(TaxRecord.date >= edge_start)
+            if edge_end:
+                query = query.filter(TaxRecord.date <= edge_end)
+
+            for row in query.group_by(*cols).all():
+                _accumulate(totals, row, len(group_by))
+
+    return {
+        key: [paise_to_rupees(t[0]), paise_to_rupees(t[1]), paise_to_rupees(t[2]), t[3]]
+        for key, t in totals.items()
+    }
+
+
+def _accumulate(totals, row, key_len: int) -> None:
+    # Sums come back through the Paise type as rupees; add them as paise
+    key = tuple(row[:key_len])
+    t = totals[key]
+    t[0] += rupees_to_paise(row[key_len] or 0)
+    t[1] += rupees_to_paise(row[key_len + 1] or 0)
+    t[2] += rupees_to_paise(row[key_len + 2] or 0)
+    t[3] += int(row[key_len + 3] or 0)
+
+
+def rollup_month_bounds(db: Session, user_id: int):
+    """(first_month, last_month) the user has data for, or (None, None)."""
+    return (
+        db.query(func.min(MonthlyRollup.month), func.max(MonthlyRollup.month))
+        .filter(MonthlyRollup.user_id == user_id)
+        .one()
+    )
+
@@ -1,6 +1,9 @@
-from typing import List
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Optional, Tuple
 from app.models.tax_record import TaxRecord
-from app.services.tax_rules import compute_income_tax
+from app.services.gst_rate_resolver import resolve_gst_rate
+from app.services.tax_regimes import TaxRuleTable, rule_table_for
+from app.utils.money import add_rupees, paise_to_rupees, rupees_to_paise, tax_paise
 
 def compute_tax_for_record(record: TaxRecord) -> None:
     """
@@ -8,32 +11,47 @@ def compute_tax_for_record(record: TaxRecord) -> None:
 
     Rules:
     1. tax_rate is the single source of truth
-    2. legacy tax_type is used ONLY as a fallback
+    2. when missing, it is resolved from hsn_code / category / legacy
+       tax_type (see gst_rate_resolver); tax_rate_source records which
     3. tax_rate is always persisted (never None)
     """
 
-    taxable = record.taxable_amount or 0.0
-
     # ✅ determine tax rate (once)
-    if record.tax_rate is None:
-        if record.tax_type == "GST":
-            record.tax_rate = 18.0
-        else:
-            record.tax_rate = 0.0
+    record.tax_rate, record.tax_rate_source = resolve_gst_rate(record)
 
     # ✅ compute tax
-    record.tax_amount = round((taxable * record.tax_rate) / 100, 2)
-    record.total_amount = round(taxable + record.tax_amount, 2)
+    record.tax_amount, record.total_amount = compute_tax_amounts(record.taxable_amount, record.tax_rate)
+
+
+def compute_tax_amounts(taxable: Optional[float], tax_rate: float) -> Tuple[float, float]:
+    """
+    (tax_amount, total_amount) in rupees, computed in integer paise: tax is
+    rounded half-up once (like the legacy backfill's SQL), and the total is
+    the exact sum.
+    """
+    taxable_p = rupees_to_paise(taxable or 0.0)
+    tax_p = tax_paise(taxable_p, tax_rate)
+    return paise_to_rupees(tax_p), paise_to_rupees(taxable_p + tax_p)
+
+
+def taxable_from_total(total: float, tax_rate: float) -> float:
+    """
+    The taxable value inside a tax-inclusive total (e.g. an invoice's
+    grand total): total / (1 + rate/100), to the nearest paisa.
+    """
+    taxable_p = Decimal(rupees_to_paise(total)) * 100 / (100 + Decimal(str(tax_rate)))
+    return paise_to_rupees(taxable_p.quantize(Decimal(1), rounding=ROUND_HALF_UP))
 
 
-def compute_summary(records: List[TaxRecord]) -> dict:
-    total_income = 0.0
-    total_expense = 0.0
-    gst_tax = 0.0
+def compute_summary(records: List[TaxRecord], rules: Optional[TaxRuleTable] = None) -> dict:
+    # Summed as integer paise
+    total_income = 0
+    total_expense = 0
+    gst_tax = 0
 
     for r in records:
-        taxable = r.taxable_amount or 0.0
-        tax = r.tax_amount or 0.0
+        taxable = rupees_to_paise(r.taxable_amount or 0.0)
+        tax = rupees_to_paise(r.tax_amount or 0.0)
 
         if r.transaction_type == "income":
             total_income += taxable
@@ -41,12 +59,34 @@ def compute_summary(records: List[TaxRecord]) -> dict:
             total_expense += taxable
 
         gst_tax += tax
-    
+
+    return compute_summary_from_totals(
+        paise_to_rupees(total_income),
+        paise_to_rupees(total_expense),
+        paise_to_rupees(gst_tax),
+        rules,
+    )
+
+
+def compute_summary_from_totals(
+    total_income: float,
+    total_expense: float,
+    gst_tax: float,
+    rules: Optional[TaxRuleTable] = None,
+) -> dict:
+    """
+    Same output as compute_summary, from pre-aggregated sums.
+
+    `rules` is the income tax table for the period (see
+    rule_table_for(period_end)); defaults to the one in force today.
+    """
+    rules = rules or rule_table_for()
+
     # Calculate income tax based on total income
-    income_tax = compute_income_tax(total_income)
+    income_tax = rules.income_tax(total_income)
     
     # Total estimated tax is GST + Income Tax
-    estimated_tax = gst_tax + income_tax
+    estimated_tax = add_rupees(gst_tax, income_tax)
 
     return {
         "total_income": round(total_income, 2),
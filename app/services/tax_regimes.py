@@ -0,0 +1,112 @@
+import json
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import TAX_RULES_PATH
+from app.services.tax_rules import cumulative_slab_tax, round_money
+from app.utils.periods import financial_year_range
+
+
+class TaxRuleError(ValueError):
+    """A financial year or regime the rule tables can't serve (the API answers 400)."""
+
+
+class TaxRuleTable:
+    """
+    One financial year's income tax rules under one regime, compiled into
+    arrays so any number of incomes is taxed with a searchsorted and one
+    multiply-add, then rebate (section 87A) and cess.
+    """
+
+    def __init__(self, fy: str, regime: str, slabs, cess_rate: float, rebate_limit: float, rebate_max: float):
+        self.fy = fy
+        self.regime = regime
+        self.slabs = [(float("inf") if limit is None else float(limit), float(rate)) for limit, rate in slabs]
+        self.cess_rate = cess_rate
+        self.rebate_limit = rebate_limit
+        self.rebate_max = rebate_max
+
+        self._upper = np.array([limit for limit, _ in self.slabs])
+        self._lower = np.array([0.0] + [limit for limit, _ in self.slabs[:-1]])
+        self._rate = np.array([rate for _, rate in self.slabs])
+        self._base_tax = cumulative_slab_tax(self.slabs)
+
+    def liability_batch(self, incomes) -> Dict[str, np.ndarray]:
+        """slab_tax, rebate, cess and income_tax (the total) for an array of incomes."""
+        incomes = np.asarray(incomes, dtype=float)
+        slab = np.minimum(np.searchsorted(self._upper, incomes, side="left"), len(self._upper) - 1)
+
+        slab_tax = self._base_tax[slab] + (incomes - self._lower[slab]) * self._rate[slab]
+        slab_tax = np.where(incomes > 0, slab_tax, 0.0)
+
+        rebate = np.where(incomes <= self.rebate_limit, np.minimum(slab_tax, self.rebate_max), 0.0)
+        cess = (slab_tax - rebate) * self.cess_rate
+
+        return {
+            "slab_tax": round_money(slab_tax),
+            "rebate": round_money(rebate),
+            "cess": round_money(cess),
+            "income_tax": round_money(slab_tax - rebate + cess),
+        }
+
+    def income_tax_batch(self, incomes) -> np.ndarray:
+        """Total income tax (after rebate and cess) for an array of incomes."""
+        return self.liability_batch(incomes)["income_tax"]
+
+    def income_tax(self, total_income: float) -> float:
+        return float(self.income_tax_batch([total_income])[0])
+
+
+class TaxRuleRegistry:
+    def __init__(self, raw: dict):
+        self.tables: Dict[Tuple[str, str], TaxRuleTable] = {}
+        self.default_regimes: Dict[str, str] = {}
+
+        for fy, spec in raw.items():
+            if fy.startswith("_"):
+                continue
+            self.default_regimes[fy] = spec["default_regime"]
+            for regime, rules in spec["regimes"].items():
+                self.tables[(fy, regime)] = TaxRuleTable(fy, regime, **rules)
+
+        self.years = sorted(self.default_regimes)
+
+    def resolve_fy(self, fy: str) -> str:
+        """Years past the newest table use the newest; years before the oldest use the oldest."""
+        if fy in self.default_regimes:
+            return fy
+        earlier = [y for y in self.years if y <= fy]
+        return earlier[-1] if earlier else self.years[0]
+
+    def get(self, fy: str, regime: Optional[str] = None) -> TaxRuleTable:
+        fy = self.resolve_fy(fy)
+        regime = regime or self.default_regimes[fy]
+        table = self.tables.get((fy, regime))
+        if table is None:
+            raise TaxRuleError(f"Unknown tax regime for FY {fy}: {regime}")
+        return table
+
+    def regimes(self, fy: str) -> List[TaxRuleTable]:
+        fy = self.resolve_fy(fy)
+        return [table for (year, _), table in self.tables.items() if year == fy]
+
+
+@lru_cache(maxsize=1)
+def get_tax_rule_registry() -> TaxRuleRegistry:
+    """Parsed and compiled once per process."""
+    with open(TAX_RULES_PATH) as f:
+        return TaxRuleRegistry(json.load(f))
+
+
+def fy_label(day: date) -> str:
+    """'2024-25' for any date from 1 Apr 2024 to 31 Mar 2025."""
+    start, _ = financial_year_range(day)
+    return f"{start.year}-{(start.year + 1) % 100:02d}"
+
+
+def rule_table_for(day: Optional[date] = None, regime: Optional[str] = None) -> TaxRuleTable:
+    """The table in force on `day` (today by default), under its default regime unless one is given."""
+    return get_tax_rule_registry().get(fy_label(day or date.today()), regime)
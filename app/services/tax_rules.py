@@ -1,35 +1,57 @@
-from typing import Tuple
+import numpy as np
 
 
-# ---------- GST RULES (v0) ----------
-GST_RATE = 0.18
+# Income tax itself lives in tax_regimes (per-FY, per-regime tables from
+# app/data/tax_rules.json); these are the array helpers it is built on,
+# plus the per-income reference the batch path must match exactly.
 
 
-def compute_gst(taxable_amount: float) -> float:
-    return round(taxable_amount * GST_RATE, 2)
-
-
-# ---------- INCOME TAX SLABS (India – v0 simplified) ----------
-# Assumption: Old regime, individual, no deductions
+def scalar_income_tax(table, total_income: float) -> float:
+    """
+    One income through `table` (a TaxRuleTable) the plain way: walk the
+    slabs, then 87A rebate and cess, then round(x, 2). The reference for
+    TaxRuleTable.income_tax_batch (tests/test_tax_rules.py).
+    """
+    tax = 0.0
+    previous_limit = 0.0
+    for limit, rate in table.slabs:
+        if total_income <= previous_limit:
+            break
+        tax += (min(total_income, limit) - previous_limit) * rate
+        previous_limit = limit
 
-INCOME_TAX_SLABS = [
-    (250000, 0.0),
-    (500000, 0.05),
-    (1000000, 0.20),
-    (float("inf"), 0.30),
-]
+    rebate = min(tax, table.rebate_max) if total_income <= table.rebate_limit else 0.0
+    cess = (tax - rebate) * table.cess_rate
+    return round(tax - rebate + cess, 2)
 
 
-def compute_income_tax(total_income: float) -> float:
+def cumulative_slab_tax(slabs) -> np.ndarray:
+    """Tax due on every slab below each slab, for [(upper_limit, rate), ...]."""
+    base = []
     tax = 0.0
     previous_limit = 0.0
+    for limit, rate in slabs:
+        base.append(tax)
+        tax += (limit - previous_limit) * rate
+        previous_limit = limit
+    return np.array(base)
 
-    for limit, rate in INCOME_TAX_SLABS:
-        if total_income <= previous_limit:
-            break
 
-        taxable = min(total_income, limit) - previous_limit
-        tax += taxable * rate
-        previous_limit = limit
+def round_money(values: np.ndarray) -> np.ndarray:
+    """
+    Element-wise round(x, 2), bit-identical to Python's round().
+
+    np.round scales by 100 first, which can tip values sitting on a
+    half-paisa boundary the other way; only those few are re-rounded in
+    Python.
+    """
+    scaled = values * 100
+    rounded = np.round(values, 2)
+
+    with np.errstate(invalid="ignore"):  # inf - inf for infinite inputs
+        distance = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+    tie_ish = distance <= np.maximum(np.abs(scaled), 1.0) * 4 * np.finfo(float).eps
+    for i in np.flatnonzero(tie_ish):
+        rounded[i] = round(float(values[i]), 2)
 
-    return round(tax, 2)
\ No newline at end of file
+    return rounded
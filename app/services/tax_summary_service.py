@@ -1,35 +1,30 @@
 from sqlalchemy.orm import Session
-from app.models.tax_record import TaxRecord
-from app.services.tax_rules import compute_income_tax
+from app.services.rollup_service import summarize_range
+from app.services.tax_regimes import rule_table_for
+from app.utils.money import add_rupees, sum_rupees
 
 
 def build_tax_summary(db: Session, user_id: int) -> dict:
-    records = (
-        db.query(TaxRecord)
-        .filter(TaxRecord.user_id == user_id)
-        .all()
+    """
+    All-time totals; income tax uses the rule table in force today (the
+    period's end), as /reports/summary does for its range.
+    """
+    totals = summarize_range(
+        db,
+        user_id,
+        group_by=("transaction_type", "tax_type"),
     )
 
-    total_income = 0.0
-    total_expense = 0.0
-    gst_paid = 0.0
+    total_income = sum_rupees(t[0] for (kind, _), t in totals.items() if kind == "income")
+    total_expense = sum_rupees(t[0] for (kind, _), t in totals.items() if kind == "expense")
+    gst_paid = sum_rupees(t[1] for (_, tax_type), t in totals.items() if tax_type == "GST")
 
-    for r in records:
-        if r.transaction_type == "income":
-            total_income += r.taxable_amount
-
-        elif r.transaction_type == "expense":
-            total_expense += r.taxable_amount
-
-        if r.tax_type == "GST" and r.tax_amount:
-            gst_paid += r.tax_amount
-
-    income_tax_estimate = compute_income_tax(total_income)
+    income_tax_estimate = rule_table_for().income_tax(total_income)
 
     return {
         "total_income": round(total_income, 2),
         "total_expense": round(total_expense, 2),
         "gst_paid": round(gst_paid, 2),
         "estimated_income_tax": income_tax_estimate,
-        "estimated_total_tax": round(gst_paid + income_tax_estimate, 2),
-    }
\ No newline at end of file
+        "estimated_total_tax": add_rupees(gst_paid, income_tax_estimate),
+    }
@@ -0,0 +1,152 @@
+import logging
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.models.tax_record import TaxRecord
+from app.services.cache import get_data_version
+from app.services.categorization_service import UNCATEGORIZED, needs_category
+
+logger = logging.getLogger(__name__)
+
+# Users whose index is kept in this worker (least recently used dropped)
+MAX_INDEXED_USERS = 1000
+
+# Only categories the user chose themselves are learned from; suggested
+# categories are stored with a lower confidence_score
+USER_CHOSEN_CONFIDENCE = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z]{3,}")
+STOPWORDS = frozenset({
+    "the", "and", "for", "from", "with", "via", "payment", "paid", "order",
+    "bill", "invoice", "txn", "ref", "upi", "neft", "imps", "pvt", "ltd",
+})
+
+
+def description_tokens(description: Optional[str]) -> List[str]:
+    """Lowercase alphabetic words, numbers and filler dropped: 'Zomato order #123' -> ['zomato']."""
+    return [t for t in _TOKEN_RE.findall((description or "").lower()) if t not in STOPWORDS]
+
+
+class UserCategoryIndex:
+    """
+    token -> {category: times the user filed a description containing the
+    token under that category}, for one user, as of data version `version`.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.token_categories: Dict[str, Counter] = {}
+
+    def add(self, description: str, category: str, count: int = 1) -> None:
+        for token in set(description_tokens(description)):
+            self.token_categories.setdefault(token, Counter())[category] += count
+
+    def lookup(self, description: str) -> Optional[Tuple[str, float]]:
+        """The user's most-chosen category for these tokens and its share of the votes."""
+        votes = Counter()
+        for token in set(description_tokens(description)):
+            counts = self.token_categories.get(token)
+            if counts:
+                votes.update(counts)
+        if not votes:
+            return None
+        category, count = votes.most_common(1)[0]
+        return category, count / sum(votes.values())
+
+
+_indexes: "OrderedDict[int, UserCategoryIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def is_user_chosen(category: Optional[str], confidence: Optional[float]) -> bool:
+    """
+    Whether a record's category is learned from. A confidence not yet set
+    (a record before its first flush) takes the column default, 1.0.
+    user_chosen_clause is the same rule in SQL.
+    """
+    if confidence is None:
+        confidence = USER_CHOSEN_CONFIDENCE
+    return not needs_category(category) and confidence >= USER_CHOSEN_CONFIDENCE
+
+
+def user_chosen_clause():
+    """is_user_chosen as a WHERE clause over tax_records."""
+    category = func.lower(func.trim(func.coalesce(TaxRecord.category, "")))
+    return and_(
+        func.coalesce(TaxRecord.confidence_score, USER_CHOSEN_CONFIDENCE) >= USER_CHOSEN_CONFIDENCE,
+        category.notin_(["", UNCATEGORIZED]),
+    )
+
+
+def build_user_category_index(db: Session, user_id: int) -> UserCategoryIndex:
+    """From the user's whole history with one grouped query."""
+    # Read the version first: a write committing during the query bumps
+    # it, so the index is rebuilt next time rather than trusted
+    index = UserCategoryIndex(get_data_version(user_id))
+
+    rows = db.execute(
+        select(TaxRecord.description, TaxRecord.category, func.count())
+        .where(TaxRecord.user_id == user_id, user_chosen_clause())
+        .group_by(TaxRecord.description, TaxRecord.category)
+    )
+    for description, category, count in rows:
+        index.add(description, category, count)
+
+    logger.debug("Built category index for user %s: %d tokens", user_id, len(index.token_categories))
+    return index
+
+
+def get_user_category_index(db: Session, user_id: int) -> UserCategoryIndex:
+    """The cached index, rebuilt when the user's data changed elsewhere (another worker, a backfill)."""
+    version = get_data_version(user_id)
+    with _lock:
+        index = _indexes.get(user_id)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(user_id)
+            return index
+
+    index = build_user_category_index(db, user_id)
+    with _lock:
+        _indexes[user_id] = index
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > MAX_INDEXED_USERS:
+            _indexes.popitem(last=False)
+    return index
+
+
+def category_samples(records: Iterable[TaxRecord]) -> List[Tuple[str, str]]:
+    """
+    (description, category) for records whose category the user chose.
+    Taken before the commit, while the attributes are still loaded (like
+    record_contributions).
+    """
+    return [
+        (r.description, r.category)
+        for r in records
+        if is_user_chosen(r.category, r.confidence_score)
+    ]
+
+
+def carry_forward_category_index(
+    user_id: int,
+    old_version: int,
+    new_version: int,
+    samples: List[Tuple[str, str]],
+) -> None:
+    """
+    Applies a write's samples to the user's index (if this worker has one
+    at old_version) and moves it to new_version. Anything else is left to
+    the version check in get_user_category_index.
+    """
+    with _lock:
+        index = _indexes.get(user_id)
+        if index is None or index.version != old_version:
+            return
+        for description, category in samples:
+            index.add(description, category)
+        index.version = new_version
@@ -0,0 +1,24 @@
+import gzip
+
+import orjson
+from fastapi import Request, Response
+
+
+def encode_json_gzip(payload) -> bytes:
+    """orjson-encode a plain dict/list payload and gzip it, ready to cache."""
+    return gzip.compress(orjson.dumps(payload), compresslevel=6)
+
+
+def gzip_json_response(request: Request, body: bytes) -> Response:
+    """
+    Serves a pre-encoded, pre-compressed JSON body as-is. Clients that do
+    not accept gzip get it decompressed. GZipMiddleware leaves responses
+    that already carry Content-Encoding alone.
+    """
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=gzip.decompress(body), media_type="application/json")
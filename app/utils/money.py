@@ -0,0 +1,72 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+PAISE_PER_RUPEE = 100
+
+
+def rupees_to_paise(value: Union[float, Decimal]) -> int:
+    # Via the shortest decimal repr, so 0.1 + 0.2 is 30 paise, not 30.000000000000004;
+    # half-paisa rounds up, like the migration's ROUND(NUMERIC)
+    paise = Decimal(str(value)) * PAISE_PER_RUPEE
+    return int(paise.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def paise_to_rupees(value: Union[int, Decimal]) -> float:
+    # Postgres SUM(bigint) comes back as NUMERIC -> Decimal
+    return int(value) / PAISE_PER_RUPEE
+
+
+def tax_paise(taxable_paise: int, rate_percent: Union[float, Decimal]) -> int:
+    """taxable * rate / 100 in exact decimal arithmetic, half-paisa rounded up."""
+    tax = Decimal(taxable_paise) * Decimal(str(rate_percent)) / 100
+    return int(tax.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def sum_rupees(values: Iterable[Optional[float]]) -> float:
+    """Exact sum of rupee amounts: added as integer paise, converted once."""
+    return paise_to_rupees(sum(rupees_to_paise(v) for v in values if v))
+
+
+def add_rupees(a: Optional[float], b: Optional[float]) -> float:
+    return sum_rupees((a, b))
+
+
+def paise_array(values) -> np.ndarray:
+    """
+    Rupee amounts (whole paise, e.g. sums read through Paise columns) as an
+    int64 paise array. rint recovers the integer exactly; arithmetic on the
+    result is exact.
+    """
+    return np.rint(np.asarray(values, dtype=float) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+class Paise(TypeDecorator):
+    """
+    Money column stored as a BIGINT count of paise, exposed as rupees.
+
+    The conversion happens here, at the DB type boundary, so ORM
+    attributes, Core selects, bound filter values and SUM()/COALESCE()
+    over the column all read and write plain rupee floats while the
+    database only ever adds exact integers.
+
+    Arithmetic written in SQL (e.g. UPDATE ... SET tax_amount = ...)
+    operates on the raw paise.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return rupees_to_paise(value)
+
+    def process_result_value(self, value, dialect) -> Optional[float]:
+        if value is None:
+            return None
+        return paise_to_rupees(value)
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def financial_year_range(today: date):
+    if today.month >= 4:
+        return date(today.year, 4, 1), date(today.year + 1, 3, 31)
+    return date(today.year - 1, 4, 1), date(today.year, 3, 31)
+
+
+def _same_day_last_year(today: date) -> date:
+    # 29 Feb has no counterpart last year
+    if today.month == 2 and today.day == 29:
+        return date(today.year - 1, 2, 28)
+    return date(today.year - 1, today.month, today.day)
+
+
+def resolve_period(
+    period: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    today: Optional[date] = None,
+):
+    """Maps a period chip to an inclusive (start_date, end_date) range."""
+    today = today or date.today()
+
+    # 🔑 Period logic
+    if period:
+        if period == "month":
+            start_date = date(today.year, today.month, 1)
+            end_date = today
+
+        elif period == "prev_month":
+            first_this_month = date(today.year, today.month, 1)
+            last_prev_month = first_this_month - timedelta(days=1)
+            start_date = date(last_prev_month.year, last_prev_month.month, 1)
+            end_date = last_prev_month
+
+        elif period == "fy":
+            start_date, end_date = financial_year_range(today)
+
+        elif period == "ytd":
+            start_date = date(today.year, 1, 1)
+            end_date = today
+
+        elif period == "prev_fy":
+            start_date, end_date = financial_year_range(date(today.year - 1, today.month, 1))
+
+        elif period == "month_last_year":
+            same_day = _same_day_last_year(today)
+            start_date = date(same_day.year, same_day.month, 1)
+            end_date = same_day
+
+        elif period == "prev_ytd":
+            same_day = _same_day_last_year(today)
+            start_date = date(same_day.year, 1, 1)
+            end_date = same_day
+
+        elif period == "custom":
+            pass
+
+        else:
+            raise HTTPException(status_code=400, detail="Invalid period")
+
+    return start_date, end_date
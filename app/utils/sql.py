@@ -0,0 +1,21 @@
+from sqlalchemy import Date, cast, func
+
+
+def month_start(dialect_name: str, column):
+    """
+    SQL expression truncating a DATE column to the first day of its month.
+    Postgres uses date_trunc, SQLite (local dev) uses date(..., 'start of month').
+    """
+    if dialect_name == "sqlite":
+        return func.date(column, "start of month", type_=Date)
+    return cast(func.date_trunc("month", column), Date)
+
+
+def month_label(dialect_name: str, column):
+    """
+    SQL expression formatting a DATE column as 'YYYY-MM', for GROUP BY month.
+    Postgres: to_char(date_trunc('month', ...)), SQLite: strftime('%Y-%m', ...).
+    """
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.to_char(func.date_trunc("month", column), "YYYY-MM")
@@ -0,0 +1,47 @@
+"""
+Scalar slab loop vs TaxRuleTable.income_tax_batch (searchsorted) over
+arrays of incomes, for every FY / regime table; also checks the results
+are identical (tests/test_tax_rules.py covers the edge cases).
+
+    python -m benchmarks.bench_income_tax
+"""
+import time
+
+import numpy as np
+
+from app.services.tax_regimes import get_tax_rule_registry
+from app.services.tax_rules import scalar_income_tax
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def sample_incomes(table, n: int, rng: np.random.Generator) -> np.ndarray:
+    incomes = rng.lognormal(mean=13.0, sigma=1.0, size=n).round(2)
+    # Slab boundaries, the rebate limit, zero and negatives are the interesting edge cases
+    edges = [limit for limit, _ in table.slabs[:-1]] + [table.rebate_limit, 0.0, -100.0, 0.01]
+    incomes[: len(edges)] = edges
+    return incomes
+
+
+def main():
+    rng = np.random.default_rng(7)
+
+    for table in get_tax_rule_registry().tables.values():
+        print(f"FY {table.fy} {table.regime}")
+        for n in SIZES:
+            incomes = sample_incomes(table, n, rng)
+
+            t0 = time.perf_counter()
+            scalar = [scalar_income_tax(table, x) for x in incomes.tolist()]
+            t_scalar = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            batch = table.income_tax_batch(incomes)
+            t_batch = time.perf_counter() - t0
+
+            assert batch.tolist() == scalar, "batch result differs from the scalar loop"
+            print(f"{n:>9} incomes   scalar {t_scalar * 1000:9.2f} ms   batch {t_batch * 1000:8.2f} ms   x{t_scalar / t_batch:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+GET /records/ serialization benchmark: ORM + TaxRecordResponse (old path)
+vs Core select + orjson (fast path), at 10k and 100k records.
+
+Runs against a throwaway SQLite file, so no Postgres is needed:
+
+    python -m benchmarks.bench_list_records
+"""
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.tax_record import TaxRecord  # noqa: E402
+from app.schemas.tax_record import TaxRecordResponse  # noqa: E402
+from app.services.record_listing_service import encode_records_json, select_record_rows  # noqa: E402
+
+SIZES = (10_000, 100_000)
+REPEAT = 3
+
+
+def seed(user_id: int, n: int) -> None:
+    rnd = random.Random(user_id)
+    start = date(2022, 4, 1)
+    rows = []
+    for i in range(n):
+        taxable = round(rnd.uniform(10, 50000), 2)
+        rate = rnd.choice([0.0, 5.0, 12.0, 18.0])
+        tax = round(taxable * rate / 100, 2)
+        rows.append({
+            "user_id": user_id,
+            "source": "csv",
+            "date": start + timedelta(days=rnd.randint(0, 1000)),
+            "description": f"Transaction {i}",
+            "category": rnd.choice(["food", "travel", "rent", "salary", "shopping"]),
+            "transaction_type": rnd.choice(["income", "expense"]),
+            "taxable_amount": taxable,
+            "tax_type": "GST" if rate else "NONE",
+            "tax_rate": rate,
+            "tax_amount": tax,
+            "total_amount": round(taxable + tax, 2),
+            "confidence_score": 1.0,
+        })
+    with engine.begin() as conn:
+        conn.execute(TaxRecord.__table__.insert(), rows)
+
+
+def orm_path(db, user_id: int) -> bytes:
+    records = db.query(TaxRecord).filter(TaxRecord.user_id == user_id).all()
+    validated = [TaxRecordResponse.from_orm(r) for r in records]
+    body = json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+    db.expunge_all()
+    return body
+
+
+def fast_path(db, user_id: int) -> bytes:
+    rows, _ = select_record_rows(db, user_id)
+    return encode_records_json(rows)
+
+
+def best_of(fn, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    for user_id, n in enumerate(SIZES, start=1):
+        db.add(User(id=user_id, email=f"bench{user_id}@example.com", hashed_password="x"))
+        db.commit()
+        seed(user_id, n)
+
+        by_id = lambda body: sorted(json.loads(body), key=lambda r: r["id"])
+        assert by_id(orm_path(db, user_id)) == by_id(fast_path(db, user_id))
+
+        orm = best_of(orm_path, db, user_id)
+        fast = best_of(fast_path, db, user_id)
+        print(f"{n:>7} records   orm+pydantic {orm * 1000:8.1f} ms   core+orjson {fast * 1000:8.1f} ms   x{orm / fast:.1f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
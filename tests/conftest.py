@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# The app reads DATABASE_URL at import time: point it at a throwaway
+# SQLite file before anything under app/ is imported
+_db_dir = tempfile.mkdtemp(prefix="taxmate-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+import pytest
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.user import User
+from app.models.tax_record import TaxRecord
+from app.models.monthly_rollup import MonthlyRollup
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user(db):
+    u = User(email="user@example.com", hashed_password="x")
+    db.add(u)
+    db.commit()
+    return u
+
+
+@pytest.fixture
+def client(db, user):
+    """API client authenticated as `user`."""
+    from fastapi.testclient import TestClient
+
+    from app.core.security import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,124 @@
+import sys
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.user import User
+from app.scripts import migrate_money_to_paise as migration
+from app.services.rollup_service import summarize_range
+
+# tax_records / monthly_rollups as they were before the migration: rupee floats
+LEGACY_TABLES = [
+    """
+    CREATE TABLE tax_records (
+        id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users(id),
+        source VARCHAR NOT NULL, date DATE NOT NULL, description VARCHAR NOT NULL,
+        category VARCHAR NOT NULL, transaction_type VARCHAR NOT NULL,
+        taxable_amount FLOAT NOT NULL, tax_type VARCHAR NOT NULL, tax_rate FLOAT NOT NULL,
+        hsn_code VARCHAR, tax_rate_source VARCHAR,
+        tax_amount FLOAT, total_amount FLOAT, confidence_score FLOAT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE monthly_rollups (
+        id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, month DATE NOT NULL,
+        category VARCHAR NOT NULL, transaction_type VARCHAR NOT NULL,
+        tax_type VARCHAR NOT NULL, tax_rate FLOAT NOT NULL,
+        taxable_amount FLOAT NOT NULL, tax_amount FLOAT NOT NULL,
+        total_amount FLOAT NOT NULL, record_count INTEGER NOT NULL
+    )
+    """,
+]
+
+RECORDS = [
+    # (date, type, taxable, tax, total)
+    ("2024-05-02", "income", 1000.10, 0.0, 1000.10),
+    ("2024-05-20", "expense", 200.25, 10.01, 210.26),
+    ("2024-06-03", "expense", 99.99, 18.0, 117.99),
+]
+
+
+@pytest.fixture
+def legacy_db():
+    User.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        for ddl in LEGACY_TABLES:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@b.com', 'x')"))
+        for i, (day, kind, taxable, tax, total) in enumerate(RECORDS, start=1):
+            conn.execute(
+                text(
+                    "INSERT INTO tax_records VALUES "
+                    "(:id, 1, 'csv', :day, 'r', 'misc', :kind, :taxable, 'GST', 5, NULL, NULL, :tax, :total, 1.0)"
+                ),
+                {"id": i, "day": day, "kind": kind, "taxable": taxable, "tax": tax, "total": total},
+            )
+        # Rupee sums, as the float-era rollups held them
+        conn.execute(text(
+            "INSERT INTO monthly_rollups VALUES (1, 1, '2024-05-01', 'misc', 'income', 'GST', 5, 1000.10, 0, 1000.10, 1)"
+        ))
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def run_migration(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["migrate_money_to_paise", "--chunk-size", "2"])
+    migration.main()
+
+
+def column_type(table: str) -> str:
+    with engine.connect() as conn:
+        return str(migration._columns(conn, table)["taxable_amount"]).upper()
+
+
+def test_migrates_records_and_rollups(legacy_db, monkeypatch):
+    run_migration(monkeypatch)
+
+    assert "INT" in column_type("tax_records")
+    assert "INT" in column_type("monthly_rollups")
+
+    db = SessionLocal()
+    try:
+        totals = summarize_range(db, 1, date(2024, 5, 1), date(2024, 6, 30), group_by=("transaction_type",))
+    finally:
+        db.close()
+    assert totals[("income",)][:3] == [1000.10, 0.0, 1000.10]
+    assert totals[("expense",)][:3] == [300.24, 28.01, 328.25]
+
+
+def test_rerun_after_crash_between_swap_and_rollup_rebuild(legacy_db, monkeypatch):
+    def crash():
+        raise RuntimeError("worker killed")
+
+    with monkeypatch.context() as m:
+        m.setattr(migration, "rebuild_rollup_table", crash)
+        with pytest.raises(RuntimeError):
+            run_migration(monkeypatch)
+
+    # tax_records is swapped, monthly_rollups still holds rupee floats
+    assert "INT" in column_type("tax_records")
+    assert "INT" not in column_type("monthly_rollups")
+
+    run_migration(monkeypatch)
+
+    assert "INT" in column_type("monthly_rollups")
+    db = SessionLocal()
+    try:
+        totals = summarize_range(db, 1, date(2024, 5, 1), date(2024, 5, 31), group_by=("transaction_type",))
+    finally:
+        db.close()
+    assert totals[("income",)][:3] == [1000.10, 0.0, 1000.10]
+    assert totals[("expense",)][:3] == [200.25, 10.01, 210.26]
+
+
+def test_rerun_after_migration_repairs_rollups(legacy_db, monkeypatch):
+    run_migration(monkeypatch)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM monthly_rollups"))
+
+    run_migration(monkeypatch)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM monthly_rollups")).scalar() == 3
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import orjson
+import pyarrow as pa
+from sqlalchemy import MetaData, inspect, text
+
+from app.core.database import engine
+from app.models.tax_record import TaxRecord
+from app.models.user import User
+
+ARROW = "application/vnd.apache.arrow.stream"
+NDJSON = "application/x-ndjson"
+
+
+def seed(db, user_id, n=40):
+    for i in range(n):
+        db.add(TaxRecord(
+            user_id=user_id, source="csv", date=date(2024, 5, 1) + timedelta(days=i % 7),
+            description=f"r{i}", category="food" if i % 2 else "travel", transaction_type="expense",
+            taxable_amount=50.0 + 10 * i, tax_type="NONE", tax_rate=0.0,
+            tax_amount=0.0, total_amount=50.0 + 10 * i,
+        ))
+    db.commit()
+
+
+def test_json_ndjson_and_arrow_share_filters_and_order(client, db, user):
+    seed(db, user.id)
+    params = {"category": "food", "min_amount": 100, "max_amount": 400}
+
+    listed = [r["id"] for r in client.get("/records/", params=params).json()]
+    ndjson = [
+        orjson.loads(line)["id"]
+        for line in client.get("/records/", params=params, headers={"Accept": NDJSON}).content.splitlines()
+    ]
+    arrow = pa.ipc.open_stream(
+        client.get("/records/", params=params, headers={"Accept": ARROW}).content
+    ).read_all().column("id").to_pylist()
+
+    assert listed
+    assert listed == ndjson == arrow
+
+
+def test_every_filter_index_ends_in_date_id(db):
+    for index in inspect(engine).get_indexes("tax_records"):
+        if index["name"].startswith("ix_tax_records_user_"):
+            assert index["column_names"][0] == "user_id"
+            assert index["column_names"][-2:] == ["date", "id"], index["name"]
+
+
+def test_legacy_rows_export_the_same_totals_in_every_format(client, db, user):
+    # Legacy databases allow NULL tax fields; recreate the table that way
+    metadata = MetaData()
+    User.__table__.to_metadata(metadata)
+    table = TaxRecord.__table__.to_metadata(metadata)
+    table.c.tax_rate.nullable = True
+    table.c.tax_amount.nullable = True
+    table.c.total_amount.nullable = True
+    TaxRecord.__table__.drop(bind=engine)
+    table.create(bind=engine)
+
+    db.add(TaxRecord(
+        user_id=user.id, source="csv", date=date(2024, 5, 1), description="legacy",
+        category="food", transaction_type="expense", taxable_amount=123.45,
+        tax_type="GST", tax_rate=0.0, tax_amount=0.0, total_amount=0.0,
+    ))
+    db.commit()
+    db.execute(text("UPDATE tax_records SET tax_rate = NULL, tax_amount = NULL, total_amount = NULL"))
+    db.commit()
+
+    listed = client.get("/records/").json()
+    ndjson = [orjson.loads(line) for line in client.get("/records/", headers={"Accept": NDJSON}).content.splitlines()]
+    arrow = pa.ipc.open_stream(client.get("/records/", headers={"Accept": ARROW}).content).read_all().to_pylist()
+
+    fields = ("tax_rate", "tax_amount", "total_amount", "tax_rate_source")
+    expected = [{f: r[f] for f in fields} for r in listed]
+    assert expected[0]["tax_amount"] is not None
+    assert [{f: r[f] for f in fields} for r in ndjson] == expected
+    assert [{f: r[f] for f in fields} for r in arrow] == expected
@@ -0,0 +1,56 @@
+from datetime import date
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.tax_record import TaxRecord
+from app.models.user import User
+from app.services.cache import get_data_version
+from app.services.rollup_service import apply_records_to_rollups, rebuild_rollups, summarize_range
+
+
+def add_records(db, user_id, amounts):
+    records = [
+        TaxRecord(
+            user_id=user_id, source="csv", date=date(2024, 5, i + 1), description=f"r{i}",
+            category="misc", transaction_type="expense", taxable_amount=amount,
+            tax_type="NONE", tax_rate=0.0, tax_amount=0.0, total_amount=amount,
+        )
+        for i, amount in enumerate(amounts)
+    ]
+    db.add_all(records)
+    apply_records_to_rollups(db, user_id, records)
+    db.commit()
+
+
+def may_expense(db, user_id):
+    totals = summarize_range(db, user_id, date(2024, 5, 1), date(2024, 5, 31), group_by=("transaction_type",))
+    return totals[("expense",)][0]
+
+
+def test_rebuild_repairs_drift_and_bumps_the_users_version(db, user):
+    add_records(db, user.id, [10.10, 20.20])
+    db.query(MonthlyRollup).update({MonthlyRollup.taxable_amount: 999.0})
+    db.commit()
+    assert may_expense(db, user.id) == 999.0
+
+    before = get_data_version(user.id)
+    rebuild_rollups(db, user.id)
+
+    assert get_data_version(user.id) > before
+    assert may_expense(db, user.id) == 30.30
+
+
+def test_rebuild_all_bumps_every_affected_user(db, user):
+    other = User(email="other@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    add_records(db, user.id, [5.0])
+    # A user whose records are gone but whose rollups remain
+    add_records(db, other.id, [7.0])
+    db.query(TaxRecord).filter_by(user_id=other.id).delete()
+    db.commit()
+
+    before = {u: get_data_version(u) for u in (user.id, other.id)}
+    rebuild_rollups(db)
+
+    assert all(get_data_version(u) > v for u, v in before.items())
+    assert db.query(MonthlyRollup).filter_by(user_id=other.id).count() == 0
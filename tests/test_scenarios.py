@@ -0,0 +1,55 @@
+from datetime import date
+
+from app.models.tax_record import TaxRecord
+from app.services.rollup_service import apply_records_to_rollups
+from app.services.tax_regimes import rule_table_for
+
+
+def add_month(db, user_id, day, income, expense):
+    records = [
+        TaxRecord(
+            user_id=user_id, source="csv", date=day, description=kind, category=kind,
+            transaction_type=kind, taxable_amount=amount, tax_type="NONE", tax_rate=0.0,
+            tax_amount=0.0, total_amount=amount,
+        )
+        for kind, amount in (("income", income), ("expense", expense))
+    ]
+    db.add_all(records)
+    apply_records_to_rollups(db, user_id, records)
+    db.commit()
+
+
+def run(client, *scenarios):
+    r = client.post("/erl/scenarios", json={"scenarios": list(scenarios)})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_deltas_project_without_history(client):
+    body = run(client, {"name": "retainer", "monthly_income_delta": 50000, "monthly_expense_delta": 20000})
+
+    assert body["months_used"] == 0
+    assert body["baseline"]["projected_income"] == 0.0
+    scenario = body["scenarios"][0]
+    assert scenario["projected_income"] == 600000.0
+    assert scenario["projected_expenses"] == 240000.0
+    assert scenario["projected_income_tax"] == rule_table_for().income_tax(600000.0)
+
+
+def test_history_is_annualised_and_deltas_added_per_year(client, db, user):
+    add_month(db, user.id, date(2024, 4, 10), 100000.0, 40000.0)
+    add_month(db, user.id, date(2024, 5, 10), 100000.0, 40000.0)
+
+    body = run(
+        client,
+        {"name": "raise", "income_change_pct": 10, "monthly_income_delta": 5000},
+        {"name": "cut", "monthly_expense_delta": -100000},
+    )
+
+    assert body["months_used"] == 2
+    assert body["baseline"]["projected_income"] == 1200000.0
+    assert body["baseline"]["projected_expenses"] == 480000.0
+    raise_, cut = body["scenarios"]
+    assert raise_["projected_income"] == 1200000.0 * 1.1 + 60000.0
+    # A year is never negative
+    assert cut["projected_expenses"] == 0.0
@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+
+from app.models.tax_record import TaxRecord
+from app.services.rollup_service import apply_records_to_rollups
+from app.services.regime_comparison_service import compare_regimes, fy_range
+from app.services.tax_regimes import TaxRuleError, TaxRuleRegistry, fy_label, get_tax_rule_registry, rule_table_for
+
+RULES = {
+    "_comment": "ignored",
+    "2023-24": {
+        "default_regime": "old",
+        "regimes": {
+            "old": {"slabs": [[250000, 0.0], [None, 0.1]], "cess_rate": 0.04, "rebate_limit": 0, "rebate_max": 0},
+        },
+    },
+    "2024-25": {
+        "default_regime": "new",
+        "regimes": {
+            "old": {"slabs": [[250000, 0.0], [None, 0.1]], "cess_rate": 0.04, "rebate_limit": 0, "rebate_max": 0},
+            "new": {"slabs": [[300000, 0.0], [None, 0.05]], "cess_rate": 0.04, "rebate_limit": 0, "rebate_max": 0},
+        },
+    },
+}
+
+
+@pytest.fixture
+def registry():
+    return TaxRuleRegistry(RULES)
+
+
+def test_get_known_fy_uses_its_default_regime(registry):
+    table = registry.get("2024-25")
+    assert (table.fy, table.regime) == ("2024-25", "new")
+    assert registry.get("2024-25", "old").regime == "old"
+
+
+@pytest.mark.parametrize("fy, expected", [
+    ("2030-31", "2024-25"),  # newer than every table: the newest
+    ("2019-20", "2023-24"),  # older than every table: the oldest
+    ("2023-24", "2023-24"),
+])
+def test_unknown_fy_falls_back_to_nearest_table(registry, fy, expected):
+    assert registry.resolve_fy(fy) == expected
+    assert registry.get(fy).fy == expected
+
+
+def test_unknown_regime_raises_domain_error(registry):
+    with pytest.raises(TaxRuleError):
+        registry.get("2023-24", "new")
+    with pytest.raises(TaxRuleError):
+        registry.get("2099-00", "flat")
+
+
+def test_regimes_lists_tables_of_resolved_fy(registry):
+    assert sorted(t.regime for t in registry.regimes("2024-25")) == ["new", "old"]
+    assert [t.regime for t in registry.regimes("2010-11")] == ["old"]
+
+
+def test_fy_label_and_rule_table_for():
+    assert fy_label(date(2024, 4, 1)) == "2024-25"
+    assert fy_label(date(2025, 3, 31)) == "2024-25"
+    assert rule_table_for(date(2024, 6, 1)).fy == "2024-25"
+    assert rule_table_for(date(2024, 6, 1), "old").regime == "old"
+
+
+@pytest.mark.parametrize("fy", ["2024", "2024-26", "2024-2025", "abcd-ef"])
+def test_fy_range_rejects_malformed_fy(fy):
+    with pytest.raises(TaxRuleError):
+        fy_range(fy)
+
+
+def add_income(db, user_id, day, amount, tax=0.0):
+    record = TaxRecord(
+        user_id=user_id, source="csv", date=day, description="salary", category="salary",
+        transaction_type="income", taxable_amount=amount, tax_type="NONE", tax_rate=0.0,
+        tax_amount=tax, total_amount=amount + tax,
+    )
+    db.add(record)
+    apply_records_to_rollups(db, user_id, [record])
+    db.commit()
+
+
+def test_compare_regimes_taxes_fy_income_under_every_regime(db, user):
+    add_income(db, user.id, date(2024, 6, 1), 900000.0, tax=100.0)
+    add_income(db, user.id, date(2025, 6, 1), 50000.0)  # next FY, excluded
+
+    result = compare_regimes(db, user.id, "2024-25")
+
+    assert result["total_income"] == 900000.0
+    assert result["gst_tax"] == 100.0
+    registry = get_tax_rule_registry()
+    regimes = {r["regime"]: r for r in result["regimes"]}
+    assert set(regimes) == {t.regime for t in registry.regimes("2024-25")}
+    for name, r in regimes.items():
+        expected = registry.get("2024-25", name).income_tax(900000.0)
+        assert r["income_tax"] == expected
+        assert r["total_tax"] == round(expected + 100.0, 2)
+        assert r["is_default"] == (name == registry.default_regimes["2024-25"])
+    assert result["recommended_regime"] == min(regimes.values(), key=lambda r: r["income_tax"])["regime"]
+
+
+def test_regimes_endpoint(client, db, user):
+    add_income(db, user.id, date(2024, 6, 1), 1200000.0)
+
+    r = client.get("/reports/regimes", params={"fy": "2024-25"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["fy"] == "2024-25"
+    assert body["total_income"] == 1200000.0
+    assert {x["regime"] for x in body["regimes"]} == {"old", "new"}
+
+    r = client.get("/reports/regimes", params={"fy": "2024"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "fy must look like 2024-25"
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.services.tax_regimes import get_tax_rule_registry
+from app.services.tax_rules import round_money, scalar_income_tax
+
+TABLES = list(get_tax_rule_registry().tables.values())
+
+
+def table_id(table):
+    return f"{table.fy}-{table.regime}"
+
+
+def exact_tax(table, income: Decimal) -> Decimal:
+    """Unrounded liability in exact decimal arithmetic."""
+    tax = Decimal(0)
+    previous = Decimal(0)
+    for limit, rate in table.slabs:
+        if income <= previous:
+            break
+        upper = income if limit == float("inf") else min(income, Decimal(int(limit)))
+        tax += (upper - previous) * Decimal(str(rate))
+        previous = upper
+    if income <= table.rebate_limit:
+        tax -= min(tax, Decimal(str(table.rebate_max)))
+    return tax * (1 + Decimal(str(table.cess_rate)))
+
+
+def half_paisa_incomes(table, limit: int = 20) -> list:
+    """Incomes (whole paise) whose exact liability ends in exactly half a paisa."""
+    found = []
+    lower = 0.0
+    for upper, rate in table.slabs:
+        start = int(max(lower, table.rebate_limit)) + 1
+        if rate and start < upper:
+            for paise in range(start * 100, start * 100 + 2000):
+                income = Decimal(paise) / 100
+                if (exact_tax(table, income) * 100) % 1 == Decimal("0.5"):
+                    found.append(str(income))
+                    if len(found) >= limit:
+                        return found
+        lower = upper
+    return found
+
+
+def edge_incomes(table) -> list:
+    incomes = [0.0, -100.0, 0.01, 0.5, 1.0]
+    for limit, _ in table.slabs[:-1]:
+        incomes += [limit - 0.01, limit, limit + 0.01, limit + 1]
+    rebate_limit = table.rebate_limit
+    incomes += [rebate_limit - 0.01, rebate_limit, rebate_limit + 0.01, rebate_limit + 1, rebate_limit + 100]
+    # Just above the rebate limit, where tax jumps from zero to the full slab amount
+    incomes += [rebate_limit + k * 0.37 for k in range(1, 200)]
+    return incomes
+
+
+@pytest.mark.parametrize("table", TABLES, ids=table_id)
+def test_batch_matches_scalar_on_edges(table):
+    incomes = edge_incomes(table)
+    assert table.income_tax_batch(incomes).tolist() == [scalar_income_tax(table, x) for x in incomes]
+
+
+@pytest.mark.parametrize("table", TABLES, ids=table_id)
+def test_batch_matches_scalar_on_half_paisa_ties(table):
+    # Tables whose taxed slabs never produce an exact tie (e.g. 20%/30% with
+    # 4% cess moves 0.208/0.312 paise per paisa) contribute no cases
+    incomes = [float(x) for x in half_paisa_incomes(table)]
+    assert table.income_tax_batch(incomes).tolist() == [scalar_income_tax(table, x) for x in incomes]
+
+
+def test_half_paisa_ties_are_covered():
+    assert sum(len(half_paisa_incomes(table)) for table in TABLES) >= 20
+
+
+@pytest.mark.parametrize("table", TABLES, ids=table_id)
+def test_batch_matches_scalar_on_random_incomes(table):
+    rng = np.random.default_rng(7)
+    incomes = np.concatenate([
+        rng.lognormal(mean=13.0, sigma=1.0, size=5000).round(2),
+        rng.uniform(0, 2_000_000, size=5000).round(2),
+    ])
+    assert table.income_tax_batch(incomes).tolist() == [scalar_income_tax(table, x) for x in incomes.tolist()]
+
+
+def test_income_tax_matches_batch():
+    table = TABLES[0]
+    for income in edge_incomes(table):
+        assert table.income_tax(income) == scalar_income_tax(table, income)
+
+
+def test_round_money_matches_python_round():
+    values = [2.675, 1.005, 0.125, 0.375, 1234.565, 100.005, -2.675, 0.0, 1e15 + 0.125, 7.0049999999]
+    assert round_money(np.array(values)).tolist() == [round(v, 2) for v in values]